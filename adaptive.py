@@ -0,0 +1,102 @@
+import diagnosis_index
+
+class AdaptiveQuestioning:
+    """
+    Penentuan pertanyaan adaptif untuk satu hipotesis dengan backward chaining.
+    
+    Rule dianggap rantai gejala (IF Px THEN G.. AND G..). Rule yang salah satu
+    gejalanya sudah dijawab 0 (Tidak Pernah) tidak mungkin terpenuhi lagi;
+    gejala dari rule yang masih hidup ditanyakan lebih dulu.
+    
+    Skor mengikuti BackwardChaining.process_answers di app.py: seluruh CF gejala
+    yang dijawab digabung dengan CF1 + CF2 × (1 - CF1), tanpa melihat rule.
+    Karena itu setiap gejala hipotesis yang belum dijawab tetap kandidat,
+    termasuk yang rule-nya sudah gugur. Karena CF gejala >= 0, skor hanya bisa
+    naik; batas atasnya adalah skor sekarang digabung dengan CF pakar setiap
+    kandidat (jawaban 'Sangat yakin'). Jika batas bawah dan atas jatuh pada
+    tingkat kecanduan yang sama, klasifikasi tidak bisa berubah lagi terhadap
+    kuesioner lengkap dan kuesioner dihentikan.
+    """
+    
+    def __init__(self, rules, cf_expert, classify=None):
+        """
+        Args:
+            rules (list): Daftar rule, masing-masing list symptom_id
+            cf_expert (dict): symptom_id -> CF pakar
+            classify (callable): persentase CF -> tingkat kecanduan
+                                 (default: index threshold yang aktif)
+        """
+        self.rules = [tuple(rule) for rule in rules]
+        self.cf_expert = cf_expert
+        self.classify = classify or diagnosis_index.current().rank
+        # Urutan gejala sesuai kemunculan pertama dalam rantai rule
+        self.symptom_order = list(dict.fromkeys(s for rule in self.rules for s in rule))
+    
+    def alive_rules(self, answers):
+        """Rule yang belum gugur (tidak ada gejala yang dijawab 0)"""
+        return [
+            rule for rule in self.rules
+            if all(answers.get(symptom_id, 1) > 0 for symptom_id in rule)
+        ]
+    
+    def candidates(self, answers):
+        """Gejala hipotesis yang belum dijawab, beserta rule yang masih hidup"""
+        alive = self.alive_rules(answers)
+        return [symptom_id for symptom_id in self.symptom_order if symptom_id not in answers], alive
+    
+    def current_cf(self, answers):
+        """CF gabungan dari jawaban sejauh ini"""
+        combined = 0.0
+        for symptom_id, cf_user in answers.items():
+            combined = combined + self.cf_expert.get(symptom_id, 0.0) * cf_user * (1 - combined)
+        return combined
+    
+    def bounds(self, answers, candidates=None):
+        """
+        Returns:
+            tuple: (batas bawah, batas atas) CF akhir yang masih mungkin
+        """
+        if candidates is None:
+            candidates, _ = self.candidates(answers)
+        lower = self.current_cf(answers)
+        upper = lower
+        for symptom_id in candidates:
+            upper = upper + self.cf_expert.get(symptom_id, 0.0) * (1 - upper)
+        return lower, upper
+    
+    def next_symptom(self, answers):
+        """
+        Menentukan gejala berikutnya yang paling informatif, atau None jika
+        kuesioner bisa dihentikan.
+        
+        Gejala dipilih berdasarkan jumlah rule hidup yang memuatnya (pangkal
+        rantai rule lebih dulu, gejala dari rule yang gugur terakhir), lalu CF
+        pakar terbesar (potensi perubahan skor terbesar).
+        """
+        candidates, alive = self.candidates(answers)
+        if not candidates:
+            return None
+        
+        lower, upper = self.bounds(answers, candidates)
+        if self.classify(lower * 100) == self.classify(upper * 100):
+            return None
+        
+        return max(
+            candidates,
+            key=lambda symptom_id: (
+                sum(1 for rule in alive if symptom_id in rule),
+                self.cf_expert.get(symptom_id, 0.0)
+            )
+        )
+    
+    def progress(self, answers):
+        """Ringkasan status sesi untuk respons API"""
+        candidates, alive = self.candidates(answers)
+        lower, upper = self.bounds(answers, candidates)
+        return {
+            'answered': len(answers),
+            'remainingCandidates': len(candidates),
+            'aliveRules': len(alive),
+            'cfLowerBound': lower,
+            'cfUpperBound': upper
+        }
@@ -0,0 +1,221 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+# Admission control: token bucket per (route, klien) dan batas konkurensi per
+# route. Request yang ditolak langsung mendapat 429/503 dengan Retry-After,
+# tidak mengantre di worker.
+
+def parse_rate_limits(spec):
+    """
+    Format 'endpoint=jumlah/detik[:burst],...', misal
+    'submit_questionnaire=10/60,download_all_reports=3/60:1'.
+    
+    Returns:
+        dict: endpoint -> (token per detik, kapasitas bucket)
+    
+    Raises:
+        ValueError: Jika format tidak valid
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        endpoint, _, limit = item.partition('=')
+        limit, _, burst = limit.partition(':')
+        count, _, period = limit.partition('/')
+        count, period = int(count), float(period or 1)
+        if not endpoint or count <= 0 or period <= 0:
+            raise ValueError(f"Aturan rate limit tidak valid: {item}")
+        rules[endpoint.strip()] = (count / period, int(burst) if burst else count)
+    return rules
+
+def refill(tokens, updated, rate, capacity, now):
+    """Sisa token setelah diisi ulang sejak `updated`"""
+    return min(capacity, tokens + (now - updated) * rate)
+
+def retry_after(tokens, rate):
+    """Detik sampai token berikutnya tersedia"""
+    return max(1, math.ceil((1 - tokens) / rate))
+
+class MemoryBucketStore:
+    """Bucket di memori proses (LRU dengan batas max_keys)"""
+    
+    def __init__(self, max_keys=100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def take(self, key, rate, capacity):
+        """
+        Mengambil satu token.
+        
+        Returns:
+            tuple: (diizinkan, retry_after detik)
+        """
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = refill(tokens, updated, rate, capacity, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else retry_after(tokens, rate)
+    
+    def prune(self, older_than):
+        """Menghapus bucket yang tidak disentuh sejak `older_than` detik"""
+        cutoff = self.clock() - older_than
+        with self._lock:
+            # Urutan LRU sama dengan urutan updated
+            while self._buckets and next(iter(self._buckets.values()))[1] < cutoff:
+                self._buckets.popitem(last=False)
+
+class SQLiteBucketStore:
+    """
+    Bucket di file SQLite lokal yang dipakai bersama semua worker pada satu
+    mesin, sehingga batas berlaku per mesin, bukan per worker.
+    """
+    
+    def __init__(self, path, clock=time.time):
+        self.clock = clock
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=OFF')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS rate_bucket (key TEXT PRIMARY KEY, tokens REAL, updated REAL)'
+        )
+        self._lock = threading.Lock()
+    
+    def take(self, key, rate, capacity):
+        now = self.clock()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute('SELECT tokens, updated FROM rate_bucket WHERE key = ?', (key,)).fetchone()
+                tokens = refill(row[0], row[1], rate, capacity, now) if row else capacity
+                allowed = tokens >= 1
+                if allowed:
+                    tokens -= 1
+                self._db.execute(
+                    'INSERT OR REPLACE INTO rate_bucket (key, tokens, updated) VALUES (?, ?, ?)', (key, tokens, now)
+                )
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+        return allowed, 0 if allowed else retry_after(tokens, rate)
+    
+    def prune(self, older_than):
+        """Menghapus bucket yang tidak disentuh sejak `older_than` detik"""
+        with self._lock:
+            self._db.execute('DELETE FROM rate_bucket WHERE updated < ?', (self.clock() - older_than,))
+
+class ConcurrencyLimiter:
+    """Batas request bersamaan; acquire tidak menunggu"""
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+    
+    def try_acquire(self):
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+class AdmissionController:
+    """
+    Aturan admission per endpoint Flask.
+    
+    Args:
+        rate_limits (dict): endpoint -> (token per detik, kapasitas), lihat parse_rate_limits
+        store: MemoryBucketStore atau SQLiteBucketStore
+        concurrency (dict): endpoint -> batas request bersamaan per worker
+        busy_retry_after (int): Nilai Retry-After untuk penolakan karena konkurensi
+        prune_interval (float): Jeda antar pembersihan bucket yang menganggur (detik)
+    """
+    
+    def __init__(self, rate_limits, store, concurrency=None, busy_retry_after=5, prune_interval=60.0,
+                 clock=time.monotonic):
+        self.rate_limits = rate_limits
+        self.store = store
+        self.busy_retry_after = busy_retry_after
+        self.prune_interval = prune_interval
+        self.clock = clock
+        # Bucket yang menganggur selama waktu isi penuh sama dengan bucket baru
+        self.idle_after = max((capacity / rate for rate, capacity in rate_limits.values()), default=0)
+        self._pruned_at = clock()
+        self.limiters = {endpoint: ConcurrencyLimiter(limit) for endpoint, limit in (concurrency or {}).items() if limit}
+        self._shed = defaultdict(lambda: {'rateLimited': 0, 'concurrency': 0})
+        self._lock = threading.Lock()
+    
+    def check_rate(self, endpoint, client):
+        """
+        Returns:
+            int: Retry-After jika request ditolak, atau None jika diizinkan
+        """
+        rule = self.rate_limits.get(endpoint)
+        if rule is None:
+            return None
+        allowed, wait = self.store.take(f"{endpoint}:{client}", *rule)
+        self._maybe_prune()
+        if allowed:
+            return None
+        self._count(endpoint, 'rateLimited')
+        return wait
+    
+    def acquire(self, endpoint):
+        """
+        Returns:
+            ConcurrencyLimiter: Limiter yang harus di-release setelah respons
+                selesai, None jika endpoint tidak dibatasi
+        
+        Raises:
+            Busy: Jika batas konkurensi penuh
+        """
+        limiter = self.limiters.get(endpoint)
+        if limiter is None:
+            return None
+        if not limiter.try_acquire():
+            self._count(endpoint, 'concurrency')
+            raise Busy(self.busy_retry_after)
+        return limiter
+    
+    def _maybe_prune(self):
+        now = self.clock()
+        with self._lock:
+            if now - self._pruned_at < self.prune_interval:
+                return
+            self._pruned_at = now
+        self.store.prune(self.idle_after)
+    
+    def _count(self, endpoint, reason):
+        with self._lock:
+            self._shed[endpoint][reason] += 1
+    
+    def stats(self):
+        with self._lock:
+            shed = {endpoint: dict(counts) for endpoint, counts in self._shed.items()}
+        return {
+            'shed': shed,
+            'shedTotal': sum(sum(counts.values()) for counts in shed.values()),
+            'inFlight': {endpoint: limiter.in_flight for endpoint, limiter in self.limiters.items()}
+        }
+
+class Busy(Exception):
+    """Batas konkurensi endpoint penuh"""
+    
+    def __init__(self, retry_after):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import table, column, select, DateTime
+import diagnosis_index
+
+# Analitik kohort berbasis kolom (pandas/numpy). Data result, user dan answer
+# dibaca dalam satu query join per chunk; setiap chunk diringkas secara vektor
+# menjadi jumlah dan hitungan parsial (CohortAggregate) lalu dibuang, sehingga
+# memori tidak bergantung pada jumlah jawaban. Hanya cf_percentage per result
+# yang disimpan untuk kuantil.
+
+result_table = table('result', column('id'), column('user_id'), column('hypothesis_id'),
+                     column('cf_value'), column('cf_percentage'), column('created_at', DateTime))
+user_table = table('user', column('id'), column('program_studi'), column('angkatan'), column('jenis_kelamin'))
+answer_table = table('answer', column('result_id'), column('symptom_id'), column('cf_user'), column('cf_combined'))
+symptom_table = table('symptom', column('id'), column('code'))
+hypothesis_table = table('hypothesis', column('id'), column('code'))
+
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+COHORT_DIMENSIONS = {
+    'programStudi': 'program_studi',
+    'jenisKelamin': 'jenis_kelamin',
+    'angkatan': 'angkatan'
+}
+
+def iter_frames(connection, start=None, end=None, chunksize=50000):
+    """
+    Membaca result + user + answer dalam satu query (LEFT JOIN answer) urut
+    id result, bertahap per chunk. Baris result terakhir di setiap chunk
+    ditahan dan digabung ke chunk berikutnya sehingga setiap frame berisi
+    result yang utuh.
+    
+    Yields:
+        DataFrame: Satu baris per jawaban (atau per result tanpa jawaban)
+    """
+    query = (
+        select(
+            result_table.c.id.label('result_id'),
+            result_table.c.hypothesis_id,
+            result_table.c.cf_value,
+            result_table.c.cf_percentage,
+            result_table.c.created_at,
+            user_table.c.program_studi,
+            user_table.c.angkatan,
+            user_table.c.jenis_kelamin,
+            answer_table.c.symptom_id,
+            answer_table.c.cf_user,
+            answer_table.c.cf_combined
+        )
+        .select_from(result_table)
+        .join(user_table, user_table.c.id == result_table.c.user_id)
+        .outerjoin(answer_table, answer_table.c.result_id == result_table.c.id)
+        .order_by(result_table.c.id)
+        .execution_options(stream_results=True)
+    )
+    if start:
+        query = query.where(result_table.c.created_at >= start)
+    if end:
+        query = query.where(result_table.c.created_at < end)
+    
+    pending = None
+    for chunk in pd.read_sql(query, connection, chunksize=chunksize):
+        if chunk.empty:
+            continue
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        tail = chunk['result_id'].to_numpy() == chunk['result_id'].iloc[-1]
+        pending = chunk[tail]
+        if not tail.all():
+            yield prepare_frame(chunk[~tail])
+    if pending is not None:
+        yield prepare_frame(pending)
+
+def prepare_frame(frame):
+    frame = frame.copy()
+    frame['angkatan'] = frame['angkatan'].astype(str)
+    return frame
+
+def load_labels(connection):
+    """Kode gejala dan hipotesis (tabel kecil) untuk label output"""
+    symptoms = dict(connection.execute(select(symptom_table.c.id, symptom_table.c.code)).all())
+    hypotheses = dict(connection.execute(select(hypothesis_table.c.id, hypothesis_table.c.code)).all())
+    return symptoms, hypotheses
+
+def addiction_levels(cf_percentage, index=None):
+    """Kode tingkat kecanduan (P0-P3) untuk array persentase CF"""
+    index = index or diagnosis_index.current()
+    labels = np.array(index.codes)
+    return labels[np.digitize(np.asarray(cf_percentage, dtype=float), index.boundaries)]
+
+def add_counts(total, partial):
+    """Menjumlahkan Series/DataFrame hitungan parsial (indeks digabung)"""
+    return partial if total is None else total.add(partial, fill_value=0)
+
+class CohortAggregate:
+    """
+    Jumlah dan hitungan parsial analitik kohort yang digabung per frame.
+    Setiap frame harus berisi result yang utuh (lihat iter_frames).
+    """
+    
+    def __init__(self, index=None):
+        self.index = index or diagnosis_index.current()
+        self.total_results = 0
+        self.present_counts = None
+        self.cf_user_sums = None
+        self.cf_user_counts = None
+        self.cohort_counts = {key: None for key in COHORT_DIMENSIONS}
+        self.cf_percentages = []
+    
+    def add(self, frame):
+        results = frame.drop_duplicates('result_id')
+        self.total_results += len(results)
+        answers = frame.dropna(subset=['symptom_id'])
+        answers = answers.assign(symptom_id=answers['symptom_id'].astype(int))
+        
+        # Result yang menjawab gejala dengan cf_user > 0, per gejala
+        present = answers.loc[answers['cf_user'] > 0, ['result_id', 'symptom_id']].drop_duplicates()
+        self.present_counts = add_counts(self.present_counts, present.groupby('symptom_id').size())
+        
+        # Jumlah dan banyaknya cf_user per hipotesis per gejala
+        cf_user = answers.groupby(['hypothesis_id', 'symptom_id'])['cf_user']
+        self.cf_user_sums = add_counts(self.cf_user_sums, cf_user.sum())
+        self.cf_user_counts = add_counts(self.cf_user_counts, cf_user.count())
+        
+        # Crosstab tingkat kecanduan per dimensi kohort
+        levels = pd.Categorical(addiction_levels(results['cf_percentage'], self.index), categories=self.index.codes)
+        for key, column_name in COHORT_DIMENSIONS.items():
+            table = pd.crosstab(results[column_name].to_numpy(), levels, dropna=False)
+            self.cohort_counts[key] = add_counts(self.cohort_counts[key], table)
+        
+        self.cf_percentages.append(results['cf_percentage'].to_numpy(dtype=float))
+    
+    def result(self, symptom_codes=None, hypothesis_codes=None):
+        """
+        Returns:
+            dict: totalResults, symptomPrevalence, meanCfUserByHypothesis,
+                  cohorts (crosstab tingkat kecanduan) dan cfDistribution
+        """
+        symptom_codes = symptom_codes or {}
+        hypothesis_codes = hypothesis_codes or {}
+        total_results = self.total_results
+        
+        # Prevalensi gejala: proporsi result yang menjawab gejala dengan cf_user > 0
+        symptom_prevalence = {}
+        if total_results and self.present_counts is not None:
+            symptom_prevalence = {
+                symptom_codes.get(symptom_id, str(symptom_id)): float(count) / total_results
+                for symptom_id, count in self.present_counts.sort_index().items()
+            }
+        
+        # Rata-rata cf_user per gejala per hipotesis
+        mean_cf_user_by_hypothesis = {}
+        if self.cf_user_sums is not None and len(self.cf_user_sums):
+            mean_cf_user = (self.cf_user_sums / self.cf_user_counts).sort_index().unstack()
+            mean_cf_user_by_hypothesis = {
+                hypothesis_codes.get(hypothesis_id, str(hypothesis_id)): {
+                    symptom_codes.get(symptom_id, str(symptom_id)): float(value)
+                    for symptom_id, value in row.dropna().items()
+                }
+                for hypothesis_id, row in mean_cf_user.iterrows()
+            }
+        
+        cohorts = {}
+        for key, table in self.cohort_counts.items():
+            cohorts[key] = {} if table is None else {
+                str(group): {str(level): int(count) for level, count in row.items()}
+                for group, row in table.sort_index().iterrows()
+            }
+        
+        # Distribusi CF: kuantil dan histogram per 10%
+        cf_percentage = np.concatenate(self.cf_percentages) if self.cf_percentages else np.empty(0)
+        histogram, edges = np.histogram(cf_percentage, bins=10, range=(0, 100))
+        cf_distribution = {
+            'mean': float(cf_percentage.mean()) if total_results else 0.0,
+            'quantiles': {
+                str(q): float(value)
+                for q, value in zip(QUANTILES, np.quantile(cf_percentage, QUANTILES) if total_results else [0.0] * len(QUANTILES))
+            },
+            'histogram': [
+                {'from': float(edges[i]), 'to': float(edges[i + 1]), 'count': int(histogram[i])}
+                for i in range(len(histogram))
+            ]
+        }
+        
+        return {
+            'totalResults': total_results,
+            'symptomPrevalence': symptom_prevalence,
+            'meanCfUserByHypothesis': mean_cf_user_by_hypothesis,
+            'cohorts': cohorts,
+            'cfDistribution': cf_distribution
+        }
+
+def compute(frame, symptom_codes=None, hypothesis_codes=None):
+    """Analitik kohort untuk satu frame utuh (format iter_frames)"""
+    aggregate = CohortAggregate()
+    aggregate.add(frame)
+    return aggregate.result(symptom_codes, hypothesis_codes)
+
+def cohort_analytics(engine, start=None, end=None, chunksize=50000):
+    """Membaca data dan menghitung analitik kohort untuk rentang tanggal"""
+    aggregate = CohortAggregate()
+    with engine.connect() as connection:
+        for frame in iter_frames(connection, start, end, chunksize):
+            aggregate.add(frame)
+        symptom_codes, hypothesis_codes = load_labels(connection)
+    return aggregate.result(symptom_codes, hypothesis_codes)
@@ -1,4 +1,6 @@
-from models import db, Question, Rule, RuleSymptom, Hypothesis, Symptom
+# Model yang aktif (skema migrations.sql) didefinisikan di app.py; models.py memakai skema lama
+from app import db, Question, Rule, RuleSymptom, Hypothesis, Symptom
+import diagnosis_index
 
 class BackwardChaining:
     """
@@ -176,28 +178,9 @@ class BackwardChaining:
     def get_diagnosis_recommendation(self, cf_percentage):
         """
         Mendapatkan diagnosis dan rekomendasi berdasarkan tingkat CF
-        sesuai dengan threshold penelitian.
+        sesuai dengan threshold pada tabel hypothesis.
         """
-        if cf_percentage >= 81:
-            return (
-                "Kecanduan Game Online Tingkat Berat",
-                "Terapi perilaku (CBT), detoks digital, dukungan keluarga. Segera konsultasi dengan psikolog atau psikiater untuk penanganan intensif."
-            )
-        elif cf_percentage >= 61:
-            return (
-                "Kecanduan Game Online Tingkat Sedang", 
-                "Konsultasi psikolog, tetapkan jadwal bermain ketat. Mulai program detoks digital bertahap dan cari dukungan dari keluarga atau teman."
-            )
-        elif cf_percentage >= 40:
-            return (
-                "Kecanduan Game Online Tingkat Ringan",
-                "Batasi waktu bermain (<2 jam/hari), alihkan ke hobi fisik. Buat jadwal harian yang seimbang antara gaming dan aktivitas lain."
-            )
-        else:
-            return (
-                "Tidak Terdeteksi Kecanduan Game Online",
-                "Pertahankan pola bermain yang sehat. Tetap waspadai tanda-tanda kecanduan dan jaga keseimbangan antara gaming dan aktivitas lain."
-            )
+        return diagnosis_index.current().classify(cf_percentage).as_tuple
     
     def process_user_responses(self, responses):
         """
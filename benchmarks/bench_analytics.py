@@ -0,0 +1,87 @@
+"""
+Benchmark analitik kohort: loop objek ORM (pendekatan lama) dibandingkan
+modul analytics (satu read_sql berbasis kolom + pandas/numpy).
+
+Contoh:
+    python benchmarks/bench_analytics.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import seed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default='sqlite:////tmp/heroin_bench_analytics.db')
+    parser.add_argument('--rows', type=int, default=200_000, help='Jumlah result sintetis')
+    parser.add_argument('--answers-per-result', type=int, default=4)
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--skip-seed', action='store_true', help='Pakai data yang sudah ada')
+    return parser.parse_args()
+
+def orm_loop_analytics(app_module):
+    """Metrik yang sama dengan analytics.compute(), dihitung dengan loop ORM"""
+    results = app_module.Result.query.all()
+    prevalence = defaultdict(int)
+    cf_user_sum = defaultdict(float)
+    cf_user_count = defaultdict(int)
+    cohorts = {key: defaultdict(lambda: defaultdict(int)) for key in ('programStudi', 'jenisKelamin', 'angkatan')}
+    percentages = []
+    
+    for result in results:
+        user = result.user
+        level = app_module.rollups.addiction_bucket(result.cf_percentage)
+        cohorts['programStudi'][user.program_studi][level] += 1
+        cohorts['jenisKelamin'][user.jenis_kelamin][level] += 1
+        cohorts['angkatan'][user.angkatan][level] += 1
+        percentages.append(result.cf_percentage)
+        
+        for answer in result.answers:
+            if answer.cf_user > 0:
+                prevalence[answer.symptom_id] += 1
+            key = (result.hypothesis_id, answer.symptom_id)
+            cf_user_sum[key] += answer.cf_user
+            cf_user_count[key] += 1
+    
+    percentages.sort()
+    return {
+        'totalResults': len(results),
+        'symptomPrevalence': {k: v / len(results) for k, v in prevalence.items()},
+        'meanCfUser': {k: cf_user_sum[k] / cf_user_count[k] for k in cf_user_sum},
+        'cohorts': cohorts,
+        'median': percentages[len(percentages) // 2] if percentages else 0.0
+    }
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = args.database_url
+    import app as app_module
+    import analytics
+    
+    with app_module.app.app_context():
+        if not args.skip_seed:
+            print(f"Membuat {args.rows:,} result sintetis di {args.database_url}")
+            seed(app_module, args.rows, args.answers_per_result)
+        
+        started = time.perf_counter()
+        orm_data = orm_loop_analytics(app_module)
+        orm_time = time.perf_counter() - started
+        app_module.db.session.remove()
+        
+        started = time.perf_counter()
+        vector_data = analytics.cohort_analytics(app_module.db.engine, chunksize=args.chunksize)
+        vector_time = time.perf_counter() - started
+        
+        assert orm_data['totalResults'] == vector_data['totalResults']
+        print(f"\n{'pendekatan':<24}{'waktu (s)':>12}")
+        print(f"{'loop ORM':<24}{orm_time:>12.2f}")
+        print(f"{'analytics (vektor)':<24}{vector_time:>12.2f}")
+        print(f"speedup: {orm_time / vector_time:.1f}x untuk {vector_data['totalResults']:,} result")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark laporan Excel: implementasi sebelum template (salinan referensi di
+bawah: add_format di dalam loop, Symptom.query.get per baris) dibandingkan
+excel_export (format dibuat sekali, layout statis terkompilasi, data dari dua
+query join), baik banyak workbook per process maupun banyak responden dalam
+satu workbook.
+
+Contoh:
+    python benchmarks/bench_excel_export.py --rows 500
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import seed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default='sqlite:////tmp/heroin_bench_excel_export.db')
+    parser.add_argument('--rows', type=int, default=500, help='Jumlah result sintetis')
+    parser.add_argument('--answers-per-result', type=int, default=6)
+    parser.add_argument('--skip-seed', action='store_true', help='Pakai data yang sudah ada')
+    return parser.parse_args()
+
+def reference_excel_report(app_module, result_id):
+    """generate_excel_report sebelum excel_export (tanpa bagian trace)"""
+    import xlsxwriter
+    result = app_module.Result.query.get(result_id)
+    user = app_module.User.query.get(result.user_id)
+    hypothesis = app_module.Hypothesis.query.get(result.hypothesis_id)
+    answers = app_module.Answer.query.filter_by(result_id=result_id).order_by(app_module.Answer.id).all()
+    
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output)
+    worksheet = workbook.add_worksheet('Hasil Analisis')
+    title_format = workbook.add_format({'bold': True, 'font_size': 16, 'align': 'center'})
+    header_format = workbook.add_format({'bold': True, 'bg_color': '#9630FB', 'color': 'white', 'border': 1})
+    cell_format = workbook.add_format({'border': 1})
+    worksheet.merge_range('A1:H1', 'LAPORAN HASIL ANALISIS KECANDUAN GAME ONLINE', title_format)
+    worksheet.merge_range('A2:H2', 'Sistem Pakar HEROin', title_format)
+    worksheet.merge_range('A4:B4', 'Informasi Pengguna:', workbook.add_format({'bold': True}))
+    user_info = [('Nama:', user.nama), ('Usia:', user.usia), ('Program Studi:', user.program_studi),
+                 ('Angkatan:', user.angkatan), ('Jenis Kelamin:', user.jenis_kelamin), ('Domisili:', user.domisili)]
+    for i, (label, value) in enumerate(user_info, 5):
+        worksheet.write(f'A{i}', label, workbook.add_format({'bold': True}))
+        worksheet.write(f'B{i}', value)
+    worksheet.merge_range('A12:H12', 'Hasil Analisis:', workbook.add_format({'bold': True}))
+    analysis_info = [('Hipotesis:', hypothesis.description), ('Nilai CF:', result.cf_value),
+                     ('Persentase CF:', f'{result.cf_percentage:.2f}%'), ('Diagnosis:', result.diagnosis),
+                     ('Rekomendasi:', result.recommendation)]
+    for i, (label, value) in enumerate(analysis_info, 13):
+        worksheet.write(f'A{i}', label, workbook.add_format({'bold': True}))
+        if i in [13, 16, 17]:
+            worksheet.merge_range(f'B{i}:H{i}', value)
+        else:
+            worksheet.write(f'B{i}', value)
+    worksheet.merge_range('A19:H19', 'Detail Gejala yang Teridentifikasi:', workbook.add_format({'bold': True}))
+    for col, header in enumerate(['No', 'Kode', 'Gejala', 'CF Expert', 'CF User', 'CF Kombinasi', 'Persentase']):
+        worksheet.write(20, col, header, header_format)
+    for i, answer in enumerate(answers):
+        symptom = app_module.Symptom.query.get(answer.symptom_id)
+        row = 21 + i
+        worksheet.write(row, 0, i+1, cell_format)
+        worksheet.write(row, 1, symptom.code, cell_format)
+        worksheet.write(row, 2, symptom.description, cell_format)
+        worksheet.write(row, 3, symptom.cf_expert, cell_format)
+        worksheet.write(row, 4, answer.cf_user, cell_format)
+        worksheet.write(row, 5, answer.cf_combined, cell_format)
+        worksheet.write(row, 6, f'{answer.cf_combined * 100:.2f}%', cell_format)
+    for i, width in enumerate([5, 10, 50, 12, 12, 15, 12]):
+        worksheet.set_column(i, i, width)
+    workbook.close()
+    output.seek(0)
+    return output
+
+def report(label, seconds, count, size, baseline=None):
+    speedup = f"{baseline / seconds:>10.2f}" if baseline else f"{'':>10}"
+    print(f"{label:<40}{seconds:>10.2f}{count / seconds:>16.1f}{speedup}{size / 1024:>14.0f}")
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = args.database_url
+    import app as app_module
+    import excel_export
+    
+    with app_module.app.app_context():
+        if not args.skip_seed:
+            seed(app_module, args.rows, args.answers_per_result)
+        result_ids = [row[0] for row in app_module.db.session.query(app_module.Result.id).order_by(app_module.Result.id)]
+        app_module.get_knowledge_base()
+        count = len(result_ids)
+        
+        print(f"{'metode':<40}{'detik':>10}{'laporan/detik':>16}{'speedup':>10}{'ukuran (KB)':>14}")
+        
+        started = time.perf_counter()
+        size = sum(len(reference_excel_report(app_module, result_id).getvalue()) for result_id in result_ids)
+        baseline = time.perf_counter() - started
+        report('referensi per result', baseline, count, size)
+        
+        started = time.perf_counter()
+        size = sum(len(app_module.generate_excel_report(result_id).getvalue()) for result_id in result_ids)
+        report('generate_excel_report per result', time.perf_counter() - started, count, size, baseline)
+        
+        started = time.perf_counter()
+        reports = app_module.load_reports()
+        size = sum(len(data) for _, data in excel_export.render_workbooks(reports))
+        report('banyak workbook, satu fetch', time.perf_counter() - started, count, size, baseline)
+        
+        started = time.perf_counter()
+        reports = app_module.load_reports()
+        size = len(excel_export.render_combined(reports))
+        report('satu workbook, semua responden', time.perf_counter() - started, count, size, baseline)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark ekspor PDF massal: unduhan per result (generate_pdf_report satu per
+satu, seperti memanggil /api/download-report/<id>?format=pdf berulang)
+dibandingkan pdf_export (prefetch dua query + process pool + ZIP streaming)
+untuk beberapa jumlah worker, sehingga terlihat skala terhadap jumlah core.
+
+Contoh:
+    python benchmarks/bench_pdf_export.py --rows 500 --workers 1,2,4,8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import seed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default='sqlite:////tmp/heroin_bench_pdf_export.db')
+    parser.add_argument('--rows', type=int, default=500, help='Jumlah result sintetis')
+    parser.add_argument('--answers-per-result', type=int, default=6)
+    parser.add_argument('--workers', default=None, help='Daftar jumlah worker, misal 1,2,4 (default: 1 sampai jumlah CPU)')
+    parser.add_argument('--skip-seed', action='store_true', help='Pakai data yang sudah ada')
+    return parser.parse_args()
+
+def worker_counts(spec):
+    if spec:
+        return [int(n) for n in spec.split(',')]
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = args.database_url
+    import app as app_module
+    import pdf_export
+    
+    with app_module.app.app_context():
+        if not args.skip_seed:
+            seed(app_module, args.rows, args.answers_per_result)
+        result_ids = [row[0] for row in app_module.db.session.query(app_module.Result.id).order_by(app_module.Result.id)]
+        app_module.get_knowledge_base()
+        
+        print(f"{'metode':<36}{'detik':>10}{'laporan/detik':>16}{'speedup':>10}{'ukuran (KB)':>14}")
+        
+        started = time.perf_counter()
+        total = 0
+        for result_id in result_ids:
+            total += len(app_module.generate_pdf_report(result_id).getvalue())
+        serial = time.perf_counter() - started
+        print(f"{'per result (serial)':<36}{serial:>10.2f}{len(result_ids) / serial:>16.1f}{1:>10.2f}{total / 1024:>14.0f}")
+        
+        started = time.perf_counter()
+        reports = app_module.load_reports()
+        fetch = time.perf_counter() - started
+        print(f"{'prefetch (2 query + trace)':<36}{fetch:>10.2f}")
+        
+        for workers in worker_counts(args.workers):
+            started = time.perf_counter()
+            size = sum(len(chunk) for chunk in pdf_export.stream_zip(reports, workers))
+            elapsed = fetch + time.perf_counter() - started
+            label = f"pdf_export ZIP, {workers} worker"
+            print(f"{label:<36}{elapsed:>10.2f}{len(reports) / elapsed:>16.1f}{serial / elapsed:>10.2f}{size / 1024:>14.0f}")
+    
+    print(f"\nCPU tersedia: {os.cpu_count()}")
+
+if __name__ == '__main__':
+    main()
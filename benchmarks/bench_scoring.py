@@ -0,0 +1,206 @@
+"""
+Micro-benchmark inti CF dan backward chaining terhadap SQLite in-memory yang
+diisi dari migrations.sql: combine_certainty_factors, calculate_symptom_cf,
+interpret_cf_result, validate_hypothesis dan process_answers, untuk satu
+responden, batch responden, dan rule set patologis (ratusan gejala).
+
+Hasil dibandingkan dengan baseline tersimpan (benchmarks/baselines/scoring.json);
+kasus yang lebih lambat dari baseline × (1 + threshold) dilaporkan sebagai
+regresi dan skrip keluar dengan status 1. Baseline bergantung pada mesin,
+simpan ulang dengan --save-baseline setelah pindah mesin atau perubahan yang
+disengaja.
+
+Contoh:
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --save-baseline
+    python benchmarks/bench_scoring.py --only process_answers --threshold 0.1
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import seed_knowledge_base
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baselines', 'scoring.json')
+LEVELS = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+PATHOLOGICAL_HYPOTHESIS = 99
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=10_000, help='Jumlah responden pada kasus batch')
+    parser.add_argument('--pathological-symptoms', type=int, default=300, help='Jumlah gejala rule set patologis')
+    parser.add_argument('--rule-width', type=int, default=10, help='Jumlah gejala per rule pada rule set patologis')
+    parser.add_argument('--repeat', type=int, default=5, help='Pengulangan timeit; diambil waktu minimum')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Toleransi regresi relatif terhadap baseline')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='Simpan hasil sebagai baseline baru')
+    parser.add_argument('--only', default=None, help='Hanya kasus yang namanya mengandung teks ini')
+    return parser.parse_args()
+
+def seed_pathological(app_module, symptoms, width):
+    """
+    Hipotesis patologis: `symptoms` gejala dan satu rule per gejala; rule ke-k
+    memakai `width` gejala terakhir sampai gejala ke-k (jendela bergeser),
+    sehingga ada ratusan rule dengan premis yang saling tumpang tindih.
+    """
+    db = app_module.db
+    first_id = 1000
+    with db.engine.begin() as conn:
+        conn.execute(app_module.Hypothesis.__table__.insert(), [{
+            'id': PATHOLOGICAL_HYPOTHESIS, 'code': 'PX', 'name': 'Patologis', 'description': '',
+            'cf_threshold_min': 0.99, 'cf_threshold_max': 1.0
+        }])
+        conn.execute(app_module.Symptom.__table__.insert(), [
+            {'id': first_id + i, 'code': f'GX{i}', 'description': f'Gejala patologis {i}', 'cf_expert': 0.1 + (i % 9) / 10}
+            for i in range(symptoms)
+        ])
+        conn.execute(app_module.Rule.__table__.insert(), [
+            {'id': first_id + k, 'hypothesis_id': PATHOLOGICAL_HYPOTHESIS, 'rule_name': f'RX{k}'}
+            for k in range(1, symptoms)
+        ])
+        conn.execute(app_module.RuleSymptom.__table__.insert(), [
+            {'rule_id': first_id + k, 'symptom_id': first_id + i}
+            for k in range(1, symptoms) for i in range(max(0, k + 1 - width), k + 1)
+        ])
+
+def build_cases(app_module, args):
+    """Daftar (nama, fungsi, jumlah operasi per panggilan)"""
+    import certainty_factor
+    import backward_chaining
+    
+    rng = random.Random(42)
+    kb = app_module.get_knowledge_base()
+    
+    def respondent(hypothesis_id):
+        return [{'symptomId': s, 'cfUser': rng.choice(LEVELS)} for s in kb.required_symptoms[hypothesis_id]]
+    
+    single = respondent(3)
+    batch = [(hypothesis_id, respondent(hypothesis_id))
+             for hypothesis_id in (rng.choice((1, 2, 3)) for _ in range(args.batch_size))]
+    cf_values = [kb.symptoms[a['symptomId']][3] * a['cfUser'] for a in single]
+    long_cf_values = [rng.random() for _ in range(args.pathological_symptoms)]
+    
+    app_bc = {hid: app_module.BackwardChaining(hid) for hid in (1, 2, 3, PATHOLOGICAL_HYPOTHESIS)}
+    legacy_bc = {hid: backward_chaining.BackwardChaining(hid) for hid in (1, 2, 3, PATHOLOGICAL_HYPOTHESIS)}
+    
+    # Rule set patologis untuk implementasi lama yang memakai rules_mapping per instance
+    pathological_codes = [kb.symptoms[s][1] for s in kb.required_symptoms[PATHOLOGICAL_HYPOTHESIS]]
+    legacy_bc[PATHOLOGICAL_HYPOTHESIS].rules_mapping[PATHOLOGICAL_HYPOTHESIS] = {
+        'rules': [[kb.symptoms[s][1] for s in symptom_ids] for _, symptom_ids in kb.rules[PATHOLOGICAL_HYPOTHESIS]],
+        'dominant_symptoms': pathological_codes
+    }
+    pathological = [{'symptomId': s, 'cfUser': 0.8} for s in kb.required_symptoms[PATHOLOGICAL_HYPOTHESIS]]
+    pathological_codes_answers = {code: 0.8 for code in pathological_codes}
+    
+    def as_codes(answers):
+        return {kb.symptoms[a['symptomId']][1]: a['cfUser'] for a in answers}
+    
+    single_codes = as_codes(single)
+    batch_codes = [(hypothesis_id, as_codes(answers)) for hypothesis_id, answers in batch]
+    
+    def score_batch():
+        for hypothesis_id, answers in batch:
+            app_bc[hypothesis_id].process_answers(answers)
+    
+    def validate_batch():
+        for hypothesis_id, answers in batch_codes:
+            legacy_bc[hypothesis_id].validate_hypothesis(answers)
+    
+    def interpret_batch():
+        for i in range(args.batch_size):
+            certainty_factor.interpret_cf_result(i % 101)
+    
+    return [
+        ('combine_certainty_factors/app/single', lambda: app_bc[3].combine_certainty_factors(cf_values), 1),
+        ('combine_certainty_factors/legacy/single', lambda: certainty_factor.combine_certainty_factors(cf_values), 1),
+        ('combine_certainty_factors/app/pathological', lambda: app_bc[3].combine_certainty_factors(long_cf_values), 1),
+        ('combine_certainty_factors/legacy/pathological', lambda: certainty_factor.combine_certainty_factors(long_cf_values), 1),
+        ('calculate_symptom_cf/single', lambda: certainty_factor.calculate_symptom_cf(0.8, 0.6), 1),
+        ('interpret_cf_result/single', lambda: certainty_factor.interpret_cf_result(72.5), 1),
+        ('interpret_cf_result/batch', interpret_batch, args.batch_size),
+        ('validate_hypothesis/single', lambda: legacy_bc[3].validate_hypothesis(single_codes), 1),
+        ('validate_hypothesis/batch', validate_batch, args.batch_size),
+        ('validate_hypothesis/pathological',
+         lambda: legacy_bc[PATHOLOGICAL_HYPOTHESIS].validate_hypothesis(pathological_codes_answers), 1),
+        ('process_answers/single', lambda: app_bc[3].process_answers(single), 1),
+        ('process_answers/batch', score_batch, args.batch_size),
+        ('process_answers/pathological', lambda: app_bc[PATHOLOGICAL_HYPOTHESIS].process_answers(pathological), 1),
+    ]
+
+def run_case(func, repeat):
+    """Detik per panggilan (minimum dari `repeat` pengukuran)"""
+    number, elapsed = timeit.Timer(func).autorange()
+    if elapsed > 1.0:
+        # Kasus batch: pengukuran autorange ikut dihitung, cukup satu ulangan lagi
+        repeat = 1
+    return min([elapsed] + timeit.repeat(func, number=number, repeat=repeat)) / number
+
+def case_parameters(name, args):
+    """Parameter CLI yang menentukan isi kasus; baseline hanya sebanding bila sama"""
+    if name.endswith('/pathological'):
+        return {'pathologicalSymptoms': args.pathological_symptoms, 'ruleWidth': args.rule_width}
+    if name.endswith('/batch'):
+        return {'batchSize': args.batch_size}
+    return {}
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['cases']
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = 'sqlite://'
+    import app as app_module
+    
+    with app_module.app.app_context():
+        seed_knowledge_base(app_module)
+        seed_pathological(app_module, args.pathological_symptoms, args.rule_width)
+        cases = build_cases(app_module, args)
+        
+        baseline = load_baseline(args.baseline)
+        results = {}
+        regressions = []
+        print(f"{'kasus':<48}{'µs/panggilan':>16}{'µs/operasi':>14}{'baseline':>16}{'selisih':>10}")
+        for name, func, operations in cases:
+            if args.only and args.only not in name:
+                continue
+            seconds = run_case(func, args.repeat)
+            parameters = case_parameters(name, args)
+            results[name] = {'secondsPerCall': seconds, 'operations': operations, 'parameters': parameters}
+            
+            line = f"{name:<48}{seconds * 1e6:>16.2f}{seconds / operations * 1e6:>14.3f}"
+            reference = baseline.get(name)
+            if reference and reference.get('parameters', {}) != parameters:
+                # Baseline diukur dengan parameter lain, angkanya tidak sebanding
+                line += f"{'parameter beda':>26}"
+            elif reference and reference['operations'] == operations:
+                change = seconds / reference['secondsPerCall'] - 1
+                line += f"{reference['secondsPerCall'] * 1e6:>16.2f}{change * 100:>+9.1f}%"
+                if change > args.threshold:
+                    regressions.append(name)
+                    line += '  REGRESI'
+            print(line)
+    
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        merged = dict(baseline)
+        merged.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'cases': merged}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline disimpan ke {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} kasus lebih lambat dari baseline + {args.threshold:.0%}: {', '.join(regressions)}")
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark serialisasi JSON: jalur lama (objek ORM, to_dict, query per gejala,
+json stdlib dengan sort_keys) dibandingkan RowMapper langsung dari baris query
+dan encoder orjson (serialization.FastJSONProvider), untuk detail result per
+request, daftar responden besar dan payload ekspor (report_data.fetch_reports).
+
+Contoh:
+    python benchmarks/bench_serialization.py --rows 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import seed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default='sqlite:////tmp/heroin_bench_serialization.db')
+    parser.add_argument('--rows', type=int, default=5000, help='Jumlah result sintetis')
+    parser.add_argument('--answers-per-result', type=int, default=6)
+    parser.add_argument('--detail-requests', type=int, default=1000, help='Jumlah detail result yang diserialisasi')
+    parser.add_argument('--skip-seed', action='store_true', help='Pakai data yang sudah ada')
+    return parser.parse_args()
+
+def reference_result_data(app_module, result_id):
+    """Isi get_result sebelum serialization.RowMapper (hidrasi ORM per baris)"""
+    result = app_module.Result.query.get(result_id)
+    user = app_module.User.query.get(result.user_id)
+    hypothesis = app_module.Hypothesis.query.get(result.hypothesis_id)
+    answers = app_module.Answer.query.filter_by(result_id=result.id).order_by(app_module.Answer.id).all()
+    identified_symptoms = []
+    for answer in answers:
+        symptom = app_module.Symptom.query.get(answer.symptom_id)
+        identified_symptoms.append({
+            'symptomCode': symptom.code,
+            'symptomText': symptom.description,
+            'cfExpert': symptom.cf_expert,
+            'cfUser': answer.cf_user,
+            'cfCombined': answer.cf_combined,
+            'cfValue': answer.cf_combined
+        })
+    return {
+        'id': result.id,
+        'userInfo': user.to_dict(),
+        'hypothesis': hypothesis.to_dict(),
+        'cfValue': result.cf_value,
+        'cfPercentage': result.cf_percentage,
+        'diagnosis': result.diagnosis,
+        'recommendation': result.recommendation,
+        'identifiedSymptoms': identified_symptoms,
+        'createdAt': result.created_at.isoformat() if result.created_at else None
+    }
+
+def report(label, seconds, count, size, baseline=None):
+    speedup = f"{baseline / seconds:>10.2f}" if baseline else f"{'':>10}"
+    print(f"{label:<44}{seconds:>10.3f}{count / seconds:>14.0f}{speedup}{size / 1024:>14.0f}")
+
+def timed(func):
+    started = time.perf_counter()
+    size, count = func()
+    return time.perf_counter() - started, count, size
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = args.database_url
+    import app as app_module
+    import report_data
+    import serialization
+    from flask.json.provider import DefaultJSONProvider
+    
+    app = app_module.app
+    db = app_module.db
+    default_json = DefaultJSONProvider(app)
+    fast_json = serialization.FastJSONProvider(app)
+    encoder = 'orjson' if serialization.orjson is not None else 'json stdlib (orjson tidak terpasang)'
+    
+    with app.app_context():
+        if not args.skip_seed:
+            seed(app_module, args.rows, args.answers_per_result)
+        result_ids = [row[0] for row in db.session.query(app_module.Result.id).order_by(app_module.Result.id)]
+        detail_ids = result_ids[:args.detail_requests]
+        connection = db.session.connection()
+        
+        print(f"encoder cepat: {encoder}")
+        print(f"{'kasus':<44}{'detik':>10}{'baris/detik':>14}{'speedup':>10}{'ukuran (KB)':>14}")
+        
+        # Detail result per request (GET /api/result)
+        def detail_reference():
+            size = 0
+            for result_id in detail_ids:
+                size += len(default_json.dumps(reference_result_data(app_module, result_id)))
+                db.session.expunge_all()
+            return size, len(detail_ids)
+        
+        def detail_mapper(provider):
+            def run():
+                size = 0
+                for result_id in detail_ids:
+                    size += len(provider.dumps(report_data.fetch_result_detail(connection, result_id)[0]))
+                return size, len(detail_ids)
+            return run
+        
+        baseline, count, size = timed(detail_reference)
+        report('detail: ORM + to_dict + json', baseline, count, size)
+        report('detail: RowMapper + json', *timed(detail_mapper(default_json)), baseline)
+        report(f'detail: RowMapper + {encoder.split()[0]}', *timed(detail_mapper(fast_json)), baseline)
+        
+        # Daftar responden besar (semua user dalam satu payload)
+        def users_reference():
+            users = [user.to_dict() for user in app_module.User.query.order_by(app_module.User.id)]
+            db.session.expunge_all()
+            return len(default_json.dumps(users)), len(users)
+        
+        def users_mapper(provider):
+            def run():
+                rows = connection.execute(
+                    db.select(*report_data.USER_INFO.columns).order_by(report_data.user_table.c.id)
+                )
+                users = report_data.USER_INFO.all(rows)
+                return len(provider.dumps(users)), len(users)
+            return run
+        
+        baseline, count, size = timed(users_reference)
+        report('responden: ORM + to_dict + json', baseline, count, size)
+        report('responden: RowMapper + json', *timed(users_mapper(default_json)), baseline)
+        report(f'responden: RowMapper + {encoder.split()[0]}', *timed(users_mapper(fast_json)), baseline)
+        
+        # Payload ekspor: seluruh laporan dengan detail gejala, hanya encoding
+        reports = report_data.fetch_reports(connection)
+        baseline, count, size = timed(lambda: (len(default_json.dumps(reports)), len(reports)))
+        report('ekspor: json stdlib', baseline, count, size)
+        report(f'ekspor: {encoder.split()[0]}', *timed(lambda: (len(fast_json.dumps(reports)), len(reports))), baseline)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Micro-benchmark mode trace inferensi: membandingkan implementasi sebelum
+trace (salinan referensi di bawah) dengan BackwardChaining tanpa trace dan
+dengan trace, baik waktu per panggilan maupun alokasi memori (tracemalloc).
+Jalur tanpa trace harus setara dengan referensi.
+
+Contoh:
+    python benchmarks/bench_trace.py --number 20000
+"""
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20_000, help='Panggilan per pengukuran')
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+def reference_combine(cf_values):
+    """combine_certainty_factors sebelum parameter steps ditambahkan"""
+    if not cf_values:
+        return 0.0
+    if len(cf_values) == 1:
+        return cf_values[0]
+    combined_cf = cf_values[0]
+    for cf in cf_values[1:]:
+        if combined_cf >= 0 and cf >= 0:
+            combined_cf = combined_cf + cf * (1 - combined_cf)
+        elif combined_cf < 0 and cf < 0:
+            combined_cf = combined_cf + cf * (1 + combined_cf)
+        else:
+            denominator = 1 - min(abs(combined_cf), abs(cf))
+            if denominator == 0:
+                combined_cf = (combined_cf + cf) / 2
+            else:
+                combined_cf = (combined_cf + cf) / denominator
+    return max(0, min(1, combined_cf))
+
+def reference_process(kb, symptom_answers):
+    """process_answers sebelum parameter trace ditambahkan"""
+    cf_values = []
+    symptom_details = []
+    for answer in symptom_answers:
+        symptom_id = int(answer['symptomId'])
+        cf_user = float(answer['cfUser'])
+        symptom = kb.symptoms.get(symptom_id)
+        if symptom:
+            _, code, description, cf_expert = symptom
+            cf_combined = cf_expert * cf_user
+            cf_values.append(cf_combined)
+            symptom_details.append({
+                'symptomId': symptom_id,
+                'symptomCode': code,
+                'symptomText': description,
+                'cfExpert': cf_expert,
+                'cfUser': cf_user,
+                'cfCombined': cf_combined
+            })
+    final_cf = reference_combine(cf_values)
+    return {'cfValue': final_cf, 'cfPercentage': final_cf * 100, 'symptomDetails': symptom_details}
+
+def build_engine(app_module):
+    """BackwardChaining di atas snapshot knowledge base sintetis (tanpa database)"""
+    import knowledge_base
+    kb = knowledge_base.KnowledgeBase(
+        1,
+        [(1, 'P1', 'Ringan', '', 0.4, 0.6), (2, 'P2', 'Sedang', '', 0.61, 0.8), (3, 'P3', 'Berat', '', 0.81, 1.0)],
+        [(i, f'G{i}', f'Gejala {i}', 0.5 + (i % 5) / 10) for i in range(1, 13)],
+        [(i, i, f'Pertanyaan {i}') for i in range(1, 13)],
+        [(1, 3, 'R1', 2), (1, 3, 'R1', 4), (2, 3, 'R2', 2), (2, 3, 'R2', 4), (2, 3, 'R2', 6),
+         (3, 3, 'R3', 2), (3, 3, 'R3', 4), (3, 3, 'R3', 6), (3, 3, 'R3', 8), (3, 3, 'R3', 9)]
+    )
+    bc = app_module.BackwardChaining.__new__(app_module.BackwardChaining)
+    bc.hypothesis_id = 3
+    bc.kb = kb
+    return bc
+
+def measure(label, func, number, repeat):
+    seconds = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    
+    tracemalloc.start()
+    func()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    for _ in range(1000):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"{label:<36}{seconds * 1e9:>14.0f}{peak - base:>20}")
+    return seconds, peak - base
+
+def main():
+    args = parse_args()
+    import app as app_module
+    bc = build_engine(app_module)
+    
+    answers = [{'symptomId': s, 'cfUser': 0.6} for s in (2, 4, 6, 8, 9)]
+    cf_values = [bc.kb.symptoms[a['symptomId']][3] * a['cfUser'] for a in answers]
+    assert bc.process_answers(answers)['cfValue'] == reference_process(bc.kb, answers)['cfValue']
+    
+    print(f"{'implementasi':<36}{'ns/panggilan':>14}{'puncak alokasi (B)':>20}")
+    ref_combine = measure('combine referensi', lambda: reference_combine(cf_values), args.number, args.repeat)
+    new_combine = measure('combine tanpa trace', lambda: bc.combine_certainty_factors(cf_values), args.number, args.repeat)
+    measure('combine dengan trace', lambda: bc.combine_certainty_factors(cf_values, []), args.number, args.repeat)
+    ref_process = measure('process_answers referensi', lambda: reference_process(bc.kb, answers), args.number, args.repeat)
+    new_process = measure('process_answers tanpa trace', lambda: bc.process_answers(answers), args.number, args.repeat)
+    measure('process_answers dengan trace', lambda: bc.process_answers(answers, trace=True), args.number, args.repeat)
+    
+    print(f"\nselisih tanpa trace vs referensi: combine {(new_combine[0] / ref_combine[0] - 1) * 100:+.1f}% waktu, "
+          f"{new_combine[1] - ref_combine[1]:+d} B; process_answers {(new_process[0] / ref_process[0] - 1) * 100:+.1f}% waktu, "
+          f"{new_process[1] - ref_process[1]:+d} B")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Harness ekuivalensi (property-based) antar implementasi scoring: kumpulan
+jawaban acak dibangkitkan per hipotesis, setiap implementasi dibandingkan
+dengan fungsi referensi, lalu divergensi (beserta contoh yang sudah
+diperkecil) dan throughput masing-masing dilaporkan.
+
+Profil jawaban:
+    discrete    nilai skala user (0.0, 0.2, ..., 1.0), urutan acak
+    continuous  nilai bebas 0.0 - 1.0
+    mixed-sign  nilai -1.0 - 1.0 (CF negatif/berbeda tanda)
+
+Implementasi yang ditandai strict wajib identik dengan referensi pada profil
+yang didukungnya; jika tidak, skrip keluar dengan status 1. Implementasi
+lain (mis. validate_hypothesis yang mengambil maksimum antar rule) hanya
+dilaporkan. Jalur cepat baru cukup ditambahkan ke build_implementations.
+
+Contoh:
+    python benchmarks/equivalence.py --cases 5000 --seed 7
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import seed_knowledge_base
+
+LEVELS = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+PROFILES = ('discrete', 'continuous', 'mixed-sign')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=int, default=2000, help='Kumpulan jawaban per profil per hipotesis')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--tolerance', type=float, default=1e-9, help='Selisih CF maksimum yang dianggap sama')
+    return parser.parse_args()
+
+def reference_cf(kb, answers):
+    """
+    Referensi: CF gejala = CF pakar × CF user, digabung berurutan dengan
+    kombinasi MYCIN (positif, negatif, berbeda tanda), dibatasi 0-1 di akhir.
+    Gejala yang tidak dikenal diabaikan. Seperti perilaku produksi, satu CF
+    saja dikembalikan apa adanya (tidak dibatasi, bisa negatif).
+    """
+    cf_values = [kb.symptoms[a['symptomId']][3] * a['cfUser'] for a in answers if a['symptomId'] in kb.symptoms]
+    if len(cf_values) == 1:
+        return cf_values[0]
+    combined = None
+    for cf in cf_values:
+        if combined is None:
+            combined = cf
+        elif combined >= 0 and cf >= 0:
+            combined = combined + cf * (1 - combined)
+        elif combined < 0 and cf < 0:
+            combined = combined + cf * (1 + combined)
+        else:
+            denominator = 1 - min(abs(combined), abs(cf))
+            combined = (combined + cf) / 2 if denominator == 0 else (combined + cf) / denominator
+    if combined is None:
+        return 0.0
+    return max(0, min(1, combined))
+
+def build_implementations(app_module):
+    """
+    Daftar (nama, fungsi(kb, hypothesis_id, answers) -> cf atau None jika
+    kasus tidak tercakup, profil yang didukung, strict)
+    """
+    import certainty_factor
+    import backward_chaining
+    import kb_mmap
+    
+    kb = app_module.get_knowledge_base()
+    image_dir = tempfile.mkdtemp(prefix='kb-equivalence-')
+    mapped = kb_mmap.attach(image_dir, kb, lambda obj: app_module.app.json.dumps(obj, separators=(',', ':')))
+    app_engines = {}
+    legacy_engines = {}
+    
+    def app_live(kb, hypothesis_id, answers):
+        bc = app_engines.get(hypothesis_id)
+        if bc is None:
+            bc = app_engines[hypothesis_id] = app_module.BackwardChaining(hypothesis_id)
+        return bc.process_answers(answers)['cfValue']
+    
+    def decision_table(kb, hypothesis_id, answers):
+        table = kb.decision_table(hypothesis_id)
+        scored = table.score(answers) if table is not None else None
+        return scored['cfValue'] if scored is not None else None
+    
+    def mapped_decision_table(kb, hypothesis_id, answers):
+        table = mapped.decision_tables.get(hypothesis_id)
+        scored = table.score(answers) if table is not None else None
+        return scored['cfValue'] if scored is not None else None
+    
+    def certainty_factor_module(kb, hypothesis_id, answers):
+        return certainty_factor.combine_certainty_factors([
+            certainty_factor.calculate_symptom_cf(kb.symptoms[a['symptomId']][3], a['cfUser'])
+            for a in answers if a['symptomId'] in kb.symptoms
+        ])
+    
+    def legacy_validate(kb, hypothesis_id, answers):
+        bc = legacy_engines.get(hypothesis_id)
+        if bc is None:
+            bc = legacy_engines[hypothesis_id] = backward_chaining.BackwardChaining(hypothesis_id)
+        return bc.validate_hypothesis({kb.symptoms[a['symptomId']][1]: a['cfUser'] for a in answers})['confidence']
+    
+    return [
+        ('app.BackwardChaining.process_answers', app_live, PROFILES, True),
+        ('DecisionTable.score', decision_table, ('discrete',), True),
+        ('DecisionTable.score (mmap)', mapped_decision_table, ('discrete',), True),
+        ('certainty_factor.combine_certainty_factors', certainty_factor_module, ('discrete', 'continuous'), True),
+        # Rumus penelitian hanya untuk CF positif; CF negatif dilaporkan saja
+        ('certainty_factor.combine_certainty_factors', certainty_factor_module, ('mixed-sign',), False),
+        ('backward_chaining.validate_hypothesis', legacy_validate, PROFILES, False),
+    ]
+
+def generate(rng, profile, symptom_ids):
+    """Satu kumpulan jawaban: subset acak gejala hipotesis dalam urutan acak"""
+    chosen = rng.sample(symptom_ids, rng.randint(0, len(symptom_ids)))
+    if profile == 'discrete':
+        values = [rng.choice(LEVELS) for _ in chosen]
+    elif profile == 'continuous':
+        values = [rng.random() for _ in chosen]
+    else:
+        values = [rng.uniform(-1.0, 1.0) for _ in chosen]
+    return [{'symptomId': s, 'cfUser': v} for s, v in zip(chosen, values)]
+
+def shrink(answers, diverges):
+    """Memperkecil contoh divergensi dengan membuang jawaban satu per satu"""
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(answers)):
+            candidate = answers[:i] + answers[i + 1:]
+            if diverges(candidate):
+                answers = candidate
+                changed = True
+                break
+    return answers
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = 'sqlite://'
+    import app as app_module
+    
+    failed = False
+    with app_module.app.app_context():
+        seed_knowledge_base(app_module)
+        kb = app_module.get_knowledge_base()
+        implementations = build_implementations(app_module)
+        rng = random.Random(args.seed)
+        
+        # Kasus dibangkitkan sekali dan dipakai semua implementasi
+        cases = {
+            profile: [
+                (hypothesis_id, generate(rng, profile, kb.required_symptoms[hypothesis_id]))
+                for hypothesis_id in sorted(kb.required_symptoms)
+                for _ in range(args.cases)
+            ]
+            for profile in PROFILES
+        }
+        expected = {
+            profile: [reference_cf(kb, answers) for _, answers in profile_cases]
+            for profile, profile_cases in cases.items()
+        }
+        
+        print(f"{'implementasi':<44}{'profil':<12}{'kasus':>8}{'tercakup':>10}{'divergen':>10}"
+              f"{'selisih maks':>14}{'diagnosis beda':>16}{'kasus/detik':>14}")
+        for name, func, profiles, strict in implementations:
+            for profile in profiles:
+                profile_cases = cases[profile]
+                started = time.perf_counter()
+                actual = [func(kb, hypothesis_id, answers) for hypothesis_id, answers in profile_cases]
+                elapsed = time.perf_counter() - started
+                
+                covered = 0
+                divergent = []
+                max_delta = 0.0
+                diagnosis_mismatches = 0
+                for (hypothesis_id, answers), want, got in zip(profile_cases, expected[profile], actual):
+                    if got is None:
+                        continue
+                    covered += 1
+                    delta = abs(got - want)
+                    max_delta = max(max_delta, delta)
+                    if delta > args.tolerance:
+                        divergent.append((hypothesis_id, answers))
+                    if kb.threshold_index.rank(got * 100) != kb.threshold_index.rank(want * 100):
+                        diagnosis_mismatches += 1
+                
+                print(f"{name:<44}{profile:<12}{len(profile_cases):>8}{covered:>10}{len(divergent):>10}"
+                      f"{max_delta:>14.3g}{diagnosis_mismatches:>16}{len(profile_cases) / elapsed:>14,.0f}")
+                
+                if divergent:
+                    hypothesis_id, answers = divergent[0]
+                    
+                    def diverges(candidate):
+                        got = func(kb, hypothesis_id, candidate)
+                        return got is not None and abs(got - reference_cf(kb, candidate)) > args.tolerance
+                    
+                    example = shrink(answers, diverges)
+                    got = func(kb, hypothesis_id, example)
+                    print(f"    contoh minimal (hipotesis {hypothesis_id}): "
+                          f"{[(kb.symptoms[a['symptomId']][1], round(a['cfUser'], 4)) for a in example]} "
+                          f"-> {got!r}, referensi {reference_cf(kb, example)!r}")
+                    if strict:
+                        failed = True
+    
+    if failed:
+        print("\nAda implementasi strict yang berbeda dari referensi")
+        raise SystemExit(1)
+    print("\nSemua implementasi strict identik dengan referensi")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Pembuat dataset sintetis bersama untuk skrip benchmark."""
+import os
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+MIGRATIONS_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations.sql')
+
+def seed_knowledge_base(app_module, path=MIGRATIONS_SQL):
+    """
+    Membuat skema lalu menjalankan INSERT knowledge base dari migrations.sql
+    (hypothesis, symptom, rule, rule_symptom, question). Statement khusus
+    MySQL (CREATE DATABASE, trigger) dilewati sehingga bisa dipakai pada SQLite.
+    """
+    db = app_module.db
+    db.create_all()
+    with open(path, encoding='utf-8') as f:
+        sql = f.read()
+    with db.engine.begin() as conn:
+        for statement in re.findall(r'^INSERT INTO .*?;', sql, re.S | re.M):
+            conn.execute(text(re.sub(r'--[^\n]*', '', statement)))
+
+def seed(app_module, rows, answers_per_result=3, months=24, chunk=50_000, log=print):
+    """
+    Membuat ulang skema lalu mengisi hypothesis, symptom, user dan result/answer
+    sintetis yang tersebar acak dalam `months` bulan terakhir.
+    """
+    db = app_module.db
+    db.drop_all()
+    db.create_all()
+    
+    users = min(rows, 100_000)
+    now = datetime.utcnow()
+    span = months * 30 * 24 * 3600
+    programs = ['Teknik Informatika', 'Sistem Informasi', 'Manajemen', 'Akuntansi', 'Psikologi']
+    
+    with db.engine.begin() as conn:
+        conn.execute(app_module.Hypothesis.__table__.insert(), [
+            {'id': i, 'code': f'P{i}', 'name': f'P{i}', 'description': '', 'cf_threshold_min': 0, 'cf_threshold_max': 1}
+            for i in (1, 2, 3)
+        ])
+        conn.execute(app_module.Symptom.__table__.insert(), [
+            {'id': i, 'code': f'G{i}', 'description': '', 'cf_expert': 0.5 + (i % 5) / 10}
+            for i in range(1, 13)
+        ])
+        conn.execute(app_module.User.__table__.insert(), [
+            {'id': i, 'nama': f'Responden {i}', 'nama_key': f'responden {i}', 'usia': 18 + i % 8,
+             'angkatan': str(2018 + i % 8), 'program_studi': programs[i % len(programs)],
+             'domisili': 'Kota', 'jenis_kelamin': 'Laki-laki' if i % 2 else 'Perempuan', 'created_at': now}
+            for i in range(1, users + 1)
+        ])
+    
+    result_id = 0
+    answer_id = 0
+    started = time.perf_counter()
+    while result_id < rows:
+        results = []
+        answers = []
+        for _ in range(min(chunk, rows - result_id)):
+            result_id += 1
+            created_at = now - timedelta(seconds=random.randrange(span))
+            pct = random.random() * 100
+            results.append({
+                'id': result_id, 'user_id': random.randint(1, users), 'hypothesis_id': random.randint(1, 3),
+                'cf_value': pct / 100, 'cf_percentage': pct, 'diagnosis': '-', 'recommendation': '-',
+                'created_at': created_at
+            })
+            for symptom_id in random.sample(range(1, 13), answers_per_result):
+                answer_id += 1
+                cf_user = random.choice((0.2, 0.4, 0.6, 0.8, 1.0))
+                answers.append({
+                    'id': answer_id, 'result_id': result_id, 'symptom_id': symptom_id,
+                    'cf_user': cf_user, 'cf_combined': cf_user * 0.8, 'created_at': created_at
+                })
+        with db.engine.begin() as conn:
+            conn.execute(app_module.Result.__table__.insert(), results)
+            if answers:
+                conn.execute(app_module.Answer.__table__.insert(), answers)
+        log(f"  seed {result_id:,}/{rows:,} result ({time.perf_counter() - started:.1f}s)", flush=True)
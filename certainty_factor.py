@@ -1,5 +1,7 @@
-from models import db, Answer, Question, Symptom, Result
+# Model yang aktif (skema migrations.sql) didefinisikan di app.py; models.py memakai skema lama
+from app import db, Answer, Question, Symptom, Result
 from sqlalchemy import func
+import diagnosis_index
 
 def calculate_certainty_factor(user_id, result_id=None):
     """
@@ -71,40 +73,16 @@ def get_cf_percentage(cf_value):
 
 def interpret_cf_result(cf_percentage):
     """
-    Interpretasi hasil CF berdasarkan threshold penelitian:
+    Interpretasi hasil CF berdasarkan threshold pada tabel hypothesis
+    (cf_threshold_min), lihat diagnosis_index.py:
     - Kecanduan Ringan (P1): 40-60%
     - Kecanduan Sedang (P2): 61-80% 
     - Kecanduan Berat (P3): 81-100%
     - Tidak Terdeteksi: <40%
+
+    Dict yang dikembalikan dipakai bersama, jangan diubah.
     """
-    if cf_percentage >= 81:
-        return {
-            'level': 'Kecanduan Berat',
-            'code': 'P3',
-            'description': 'Kecanduan game online tingkat berat dengan durasi bermain >8 jam/hari',
-            'recommendation': 'Terapi perilaku (CBT), detoks digital, dukungan keluarga. Segera konsultasi dengan psikolog atau psikiater untuk penanganan intensif.'
-        }
-    elif cf_percentage >= 61:
-        return {
-            'level': 'Kecanduan Sedang',
-            'code': 'P2', 
-            'description': 'Kecanduan game online tingkat sedang dengan durasi bermain 4-8 jam/hari',
-            'recommendation': 'Konsultasi psikolog, tetapkan jadwal bermain ketat. Mulai program detoks digital bertahap dan cari dukungan dari keluarga atau teman.'
-        }
-    elif cf_percentage >= 40:
-        return {
-            'level': 'Kecanduan Ringan',
-            'code': 'P1',
-            'description': 'Kecanduan game online tingkat ringan dengan durasi bermain 2-4 jam/hari', 
-            'recommendation': 'Batasi waktu bermain (<2 jam/hari), alihkan ke hobi fisik. Buat jadwal harian yang seimbang antara gaming dan aktivitas lain.'
-        }
-    else:
-        return {
-            'level': 'Tidak Terdeteksi Kecanduan',
-            'code': 'P0',
-            'description': 'Tidak terdeteksi kecanduan game online',
-            'recommendation': 'Pertahankan pola bermain yang sehat. Tetap waspadai tanda-tanda kecanduan dan jaga keseimbangan antara gaming dan aktivitas lain.'
-        }
+    return diagnosis_index.current().classify(cf_percentage).as_dict
 
 def calculate_symptom_cf(cf_expert, cf_user):
     """
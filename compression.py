@@ -0,0 +1,183 @@
+import threading
+import zlib
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Kompresi respons HTTP: gzip selalu tersedia, brotli/zstd jika paketnya
+# terpasang. Body kecil dilewati, respons generator dikompresi per chunk
+# sambil di-stream, dan body yang bisa di-cache (payload knowledge base)
+# dikompresi sekali dengan level maksimum lalu dipakai ulang.
+
+class GzipEncoder:
+    def __init__(self, level):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+    
+    def compress(self, data):
+        return self._obj.compress(data)
+    
+    def finish(self):
+        return self._obj.flush()
+
+class BrotliEncoder:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+    
+    def compress(self, data):
+        return self._obj.process(data)
+    
+    def finish(self):
+        return self._obj.finish()
+
+class ZstdEncoder:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+    
+    def compress(self, data):
+        return self._obj.compress(data)
+    
+    def finish(self):
+        return self._obj.flush()
+
+# encoding -> (encoder, level per request, level untuk body yang di-cache),
+# urut preferensi server jika klien memberi bobot yang sama
+ENCODERS = OrderedDict()
+if zstandard is not None:
+    ENCODERS['zstd'] = (ZstdEncoder, 3, 19)
+if brotli is not None:
+    ENCODERS['br'] = (BrotliEncoder, 4, 11)
+ENCODERS['gzip'] = (GzipEncoder, 6, 9)
+
+# Tipe yang layak dikompresi; pdf (stream ReportLab), xlsx dan zip sudah terkompresi
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'image/svg+xml')
+
+def compressible(mimetype):
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES)
+
+def compress(data, encoding, cached=False):
+    encoder_class, level, cached_level = ENCODERS[encoding]
+    encoder = encoder_class(cached_level if cached else level)
+    return encoder.compress(data) + encoder.finish()
+
+def compress_stream(chunks, encoding):
+    """Mengompresi iterable chunk sambil di-stream; iterable asal ditutup di akhir"""
+    encoder_class, level, _ = ENCODERS[encoding]
+    encoder = encoder_class(level)
+    try:
+        for chunk in chunks:
+            data = encoder.compress(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+class CompressedBodyCache:
+    """Body terkompresi per (kunci, encoding), LRU dengan batas max_entries"""
+    
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, encoding, data):
+        cache_key = (key, encoding)
+        with self._lock:
+            body = self._entries.get(cache_key)
+            if body is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        
+        body = compress(data, encoding, cached=True)
+        with self._lock:
+            self._entries[cache_key] = body
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+    
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+class ResponseCompressor:
+    """
+    Kompresi respons Flask/Werkzeug sesuai Accept-Encoding.
+    
+    Args:
+        min_size (int): Body yang panjangnya diketahui dan lebih kecil dari ini
+            dikirim apa adanya
+        cache_entries (int): Kapasitas CompressedBodyCache
+    """
+    
+    def __init__(self, min_size=1024, cache_entries=256):
+        self.min_size = min_size
+        self.cache = CompressedBodyCache(cache_entries)
+        self.compressed = 0
+        self.streamed = 0
+    
+    def __call__(self, response, accept_encodings, cache_key=None):
+        """
+        Args:
+            accept_encodings: request.accept_encodings
+            cache_key: Kunci body yang isinya tetap (misal payload per versi KB)
+        
+        Returns:
+            Response yang sama, dikompresi jika memenuhi syarat
+        """
+        if (response.status_code != 200 or 'Content-Encoding' in response.headers
+                or not compressible(response.mimetype)):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = accept_encodings.best_match(list(ENCODERS))
+        if encoding is None:
+            return response
+        
+        if response.is_streamed or response.direct_passthrough:
+            # Panjang body tidak diketahui: kompresi per chunk saat dikirim
+            response.response = compress_stream(response.response, encoding)
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+            self.streamed += 1
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            if cache_key is not None:
+                response.set_data(self.cache.get(cache_key, encoding, data))
+            else:
+                response.set_data(compress(data, encoding))
+            self.compressed += 1
+        
+        response.headers['Content-Encoding'] = encoding
+        # Range pada body terkompresi tidak lagi sesuai dengan file aslinya
+        response.headers.pop('Accept-Ranges', None)
+        return response
+    
+    def warm(self, cache_key, data):
+        """Mengisi cache body terkompresi untuk semua encoding sebelum request pertama"""
+        if len(data) < self.min_size:
+            return 0
+        for encoding in ENCODERS:
+            self.cache.get(cache_key, encoding, data)
+        return len(ENCODERS)
+    
+    def stats(self):
+        return {
+            'encodings': list(ENCODERS),
+            'compressed': self.compressed,
+            'streamed': self.streamed,
+            'cache': self.cache.stats()
+        }
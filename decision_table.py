@@ -0,0 +1,185 @@
+from array import array
+
+# Enam tingkat jawaban user (USER_SCALE_MAP di certainty_factor.py): 0.0 - 1.0
+# dengan langkah 0.2. q / 5 menghasilkan float yang identik dengan literalnya.
+LEVELS = tuple(q / 5 for q in range(6))
+LEVEL_OF = {value: q for q, value in enumerate(LEVELS)}
+RADIX = len(LEVELS)
+
+# Batas ukuran tabel: 6^7 = 279.936 entri (sekitar 5 MB per hipotesis).
+# Hipotesis dengan gejala lebih banyak diskor live oleh BackwardChaining.
+MAX_SYMPTOMS = 7
+# Bitmask rule yang cocok disimpan sebagai uint64
+MAX_RULES = 64
+
+def limit_error(symptom_count, rule_count):
+    """Alasan hipotesis tidak bisa dibuatkan tabel keputusan, atau None"""
+    if symptom_count > MAX_SYMPTOMS:
+        return f"{symptom_count} gejala melebihi batas tabel keputusan ({MAX_SYMPTOMS})"
+    if rule_count > MAX_RULES:
+        return f"{rule_count} rule melebihi batas tabel keputusan ({MAX_RULES})"
+    return None
+
+class DecisionTable:
+    """
+    Tabel keputusan untuk satu hipotesis: setiap kombinasi jawaban diskret
+    atas gejala hipotesis dipetakan ke (cf_value, diagnosis, rule yang cocok).
+    
+    Indeks tabel adalah bilangan basis 6: sum(q_i * 6^i), dengan q_i tingkat
+    jawaban gejala ke-i dalam urutan kanonik (urutan symptoms). Ukuran tabel
+    dibatasi MAX_SYMPTOMS gejala (<= 279.936 entri) dan MAX_RULES rule, dan
+    skor cukup satu akses array.
+    
+    CF dihitung dengan rumus yang sama seperti BackwardChaining.process_answers
+    (CF1 + CF2 × (1 - CF1)) secara berurutan dalam urutan kanonik. Gejala yang
+    tidak dijawab setara dengan jawaban 0.0 (c + 0 × (1 - c) = c, tepat).
+    """
+    
+    def __init__(self, hypothesis_id, symptoms, rules, diagnose):
+        """
+        Args:
+            hypothesis_id (int): Hipotesis pemilik tabel
+            symptoms (list): [(symptom_id, code, description, cf_expert), ...]
+            rules (list): [(rule_name, [symptom_id, ...]), ...]
+            diagnose (callable): cf_value -> (diagnosis, recommendation)
+        
+        Raises:
+            ValueError: Jika hipotesis melewati MAX_SYMPTOMS atau MAX_RULES
+        """
+        error = limit_error(len(symptoms), len(rules))
+        if error:
+            raise ValueError(error)
+        self.hypothesis_id = hypothesis_id
+        self.symptoms = {symptom[0]: symptom for symptom in symptoms}
+        self.position = {symptom[0]: i for i, symptom in enumerate(symptoms)}
+        self.rule_names = [name for name, _ in rules]
+        self.size = RADIX ** len(symptoms)
+        
+        cf_values, present = self._build_cf(symptoms)
+        self.cf_values = cf_values
+        
+        # Bitmask rule yang semua gejalanya dijawab > 0
+        rule_bits = [
+            sum(1 << self.position[s] for s in rule_symptoms if s in self.position)
+            for _, rule_symptoms in rules
+        ]
+        self.matched = array('Q', (
+            sum(1 << r for r, bits in enumerate(rule_bits) if bits and mask & bits == bits)
+            for mask in present
+        ))
+        
+        # Diagnosis disimpan sebagai indeks ke daftar outcome yang unik
+        self.outcomes = []
+        outcome_index = {}
+        codes = array('B')
+        for cf_value in cf_values:
+            outcome = diagnose(cf_value)
+            if outcome not in outcome_index:
+                outcome_index[outcome] = len(self.outcomes)
+                self.outcomes.append(outcome)
+            codes.append(outcome_index[outcome])
+        self.outcome_codes = codes
+    
+    @classmethod
+    def from_buffers(cls, hypothesis_id, symptoms, rule_names, outcomes, cf_values, matched, outcome_codes):
+        """
+        Tabel dari array yang sudah dihitung, misal memoryview ke image
+        knowledge base yang di-mmap (lihat kb_mmap.py), tanpa membangun ulang.
+        """
+        table = cls.__new__(cls)
+        table.hypothesis_id = hypothesis_id
+        table.symptoms = {symptom[0]: symptom for symptom in symptoms}
+        table.position = {symptom[0]: i for i, symptom in enumerate(symptoms)}
+        table.rule_names = list(rule_names)
+        table.size = RADIX ** len(symptoms)
+        table.cf_values = cf_values
+        table.matched = matched
+        table.outcomes = list(outcomes)
+        table.outcome_codes = outcome_codes
+        return table
+    
+    def _build_cf(self, symptoms):
+        # Pemrograman dinamis per posisi: entri untuk prefiks i+1 gejala
+        # diturunkan dari prefiks i gejala, sehingga urutan operasi float sama
+        # dengan penggabungan berurutan.
+        cf_values = array('d', [0.0])
+        present = array('Q', [0])
+        for i, symptom in enumerate(symptoms):
+            cf_expert = symptom[3]
+            next_cf = array('d')
+            next_present = array('Q')
+            for q, level in enumerate(LEVELS):
+                cf_symptom = cf_expert * level
+                bit = (1 << i) if q else 0
+                next_cf.extend(cf + cf_symptom * (1 - cf) for cf in cf_values)
+                next_present.extend(mask | bit for mask in present)
+            cf_values = next_cf
+            present = next_present
+        return cf_values, present
+    
+    def index(self, symptom_answers):
+        """
+        Indeks tabel untuk jawaban [{'symptomId', 'cfUser'}], atau None jika
+        jawaban di luar cakupan tabel (gejala lain, nilai tidak diskret, ganda).
+        """
+        index = 0
+        seen = 0
+        for answer in symptom_answers:
+            position = self.position.get(answer['symptomId'])
+            q = LEVEL_OF.get(answer['cfUser'])
+            if position is None or q is None or seen & (1 << position):
+                return None
+            seen |= 1 << position
+            index += q * RADIX ** position
+        return index
+    
+    def matched_rules(self, index):
+        """Nama rule yang cocok untuk entri tabel"""
+        mask = self.matched[index]
+        return [name for r, name in enumerate(self.rule_names) if mask & (1 << r)]
+    
+    def score(self, symptom_answers):
+        """
+        Skor lewat tabel dengan format yang sama seperti process_answers,
+        ditambah diagnosis, rekomendasi dan rule yang cocok.
+        
+        Returns:
+            dict: Hasil skor, atau None jika harus memakai perhitungan live
+        """
+        index = self.index(symptom_answers)
+        if index is None:
+            return None
+        
+        cf_value = self.cf_values[index]
+        diagnosis, recommendation = self.outcomes[self.outcome_codes[index]]
+        symptom_details = []
+        for answer in symptom_answers:
+            symptom_id, code, description, cf_expert = self.symptoms[answer['symptomId']]
+            symptom_details.append({
+                'symptomId': symptom_id,
+                'symptomCode': code,
+                'symptomText': description,
+                'cfExpert': cf_expert,
+                'cfUser': answer['cfUser'],
+                'cfCombined': cf_expert * answer['cfUser']
+            })
+        
+        return {
+            'cfValue': cf_value,
+            'cfPercentage': cf_value * 100,
+            'symptomDetails': symptom_details,
+            'diagnosis': diagnosis,
+            'recommendation': recommendation,
+            'matchedRules': self.matched_rules(index)
+        }
+    
+    def entries(self):
+        """Iterasi (index, symptom_answers kanonik) untuk seluruh tabel"""
+        symptom_ids = list(self.position)
+        for index in range(self.size):
+            answers = []
+            rest = index
+            for symptom_id in symptom_ids:
+                rest, q = divmod(rest, RADIX)
+                answers.append({'symptomId': symptom_id, 'cfUser': LEVELS[q]})
+            yield index, answers
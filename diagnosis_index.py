@@ -0,0 +1,107 @@
+from bisect import bisect_right
+
+# Teks diagnosis dan rekomendasi per kode hipotesis (tidak tersimpan di tabel
+# hypothesis). P0 adalah tingkat di bawah threshold hipotesis terendah.
+DIAGNOSIS_TEXT = {
+    'P0': (
+        'Tidak Terdeteksi Kecanduan Game Online',
+        'Pertahankan pola bermain yang sehat. Tetap waspadai tanda-tanda kecanduan dan jaga keseimbangan antara gaming dan aktivitas lain.'
+    ),
+    'P1': (
+        'Kecanduan Game Online Tingkat Ringan',
+        'Batasi waktu bermain (<2 jam/hari), alihkan ke hobi fisik. Buat jadwal harian yang seimbang antara gaming dan aktivitas lain.'
+    ),
+    'P2': (
+        'Kecanduan Game Online Tingkat Sedang',
+        'Konsultasi psikolog, tetapkan jadwal bermain ketat. Mulai program detoks digital bertahap dan cari dukungan dari keluarga atau teman.'
+    ),
+    'P3': (
+        'Kecanduan Game Online Tingkat Berat',
+        'Terapi perilaku (CBT), detoks digital, dukungan keluarga. Segera konsultasi dengan psikolog atau psikiater untuk penanganan intensif.'
+    )
+}
+
+NOT_DETECTED = ('P0', 'Tidak Terdeteksi Kecanduan', 'Tidak terdeteksi kecanduan game online')
+
+# Data hipotesis bawaan migrations.sql, dipakai sebelum index dimuat dari database:
+# (code, name, description, cf_threshold_min)
+DEFAULT_HYPOTHESES = (
+    ('P1', 'Kecanduan Ringan', 'Kecanduan game online tingkat ringan dengan durasi bermain 2-4 jam/hari', 0.40),
+    ('P2', 'Kecanduan Sedang', 'Kecanduan game online tingkat sedang dengan durasi bermain 4-8 jam/hari', 0.61),
+    ('P3', 'Kecanduan Berat', 'Kecanduan game online tingkat berat dengan durasi bermain >8 jam/hari', 0.81)
+)
+
+class Diagnosis:
+    """
+    Hasil klasifikasi satu tingkat kecanduan. Objek dibuat sekali saat index
+    dibangun dan dipakai bersama; as_tuple dan as_dict jangan diubah.
+    """
+    __slots__ = ('rank', 'code', 'level', 'description', 'diagnosis', 'recommendation', 'as_tuple', 'as_dict')
+    
+    def __init__(self, rank, code, level, description, diagnosis, recommendation):
+        self.rank = rank
+        self.code = code
+        self.level = level
+        self.description = description
+        self.diagnosis = diagnosis
+        self.recommendation = recommendation
+        # Format get_diagnosis_and_recommendation / get_diagnosis_recommendation
+        self.as_tuple = (diagnosis, recommendation)
+        # Format interpret_cf_result
+        self.as_dict = {
+            'level': level,
+            'code': code,
+            'description': description,
+            'recommendation': recommendation
+        }
+
+class ThresholdIndex:
+    """
+    Index threshold tingkat kecanduan yang dibangun dari kolom
+    cf_threshold_min tabel hypothesis: batas bawah tiap hipotesis (dalam
+    persen) diurutkan, lalu klasifikasi cukup satu bisect tanpa alokasi.
+    """
+    
+    def __init__(self, hypotheses):
+        """
+        Args:
+            hypotheses (iterable): (code, name, description, cf_threshold_min)
+        """
+        ordered = sorted(hypotheses, key=lambda h: h[3])
+        # Dibulatkan agar FLOAT MySQL (presisi tunggal) tidak menggeser batas,
+        # misal 0.61 tersimpan sebagai 0.6100000143
+        self.boundaries = [round(float(h[3]) * 100, 4) for h in ordered]
+        
+        levels = [NOT_DETECTED] + [(h[0], h[1], h[2]) for h in ordered]
+        self.diagnoses = tuple(
+            Diagnosis(rank, code, level, description, *self._texts(code, level))
+            for rank, (code, level, description) in enumerate(levels)
+        )
+        self.codes = tuple(d.code for d in self.diagnoses)
+    
+    @staticmethod
+    def _texts(code, level):
+        return DIAGNOSIS_TEXT.get(code, (level, ''))
+    
+    @classmethod
+    def default(cls):
+        return cls(DEFAULT_HYPOTHESES)
+    
+    def classify(self, cf_percentage):
+        """Diagnosis untuk persentase CF (0-100)"""
+        return self.diagnoses[bisect_right(self.boundaries, cf_percentage)]
+    
+    def rank(self, cf_percentage):
+        """Peringkat tingkat kecanduan: 0 (P0) sampai jumlah hipotesis"""
+        return bisect_right(self.boundaries, cf_percentage)
+
+_current = ThresholdIndex.default()
+
+def current():
+    """Index yang sedang aktif (dari database jika sudah dipasang lewat install)"""
+    return _current
+
+def install(index):
+    """Mengganti index aktif; penggantian referensi bersifat atomik"""
+    global _current
+    _current = index
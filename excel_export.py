@@ -0,0 +1,217 @@
+import io
+import xlsxwriter
+
+# Laporan Excel berbasis template: format dibuat sekali per workbook, layout
+# statis (judul, label, header tabel) dihitung sekali saat modul dimuat, dan
+# data laporan berasal dari report_data.fetch_reports (tanpa query per baris).
+# Satu workbook bisa berisi banyak responden (satu worksheet per responden).
+
+# Baris 0-based bagian laporan per responden
+USER_ROW = 4
+ANALYSIS_ROW = 12
+DETAIL_ROW = 20
+
+USER_FIELDS = [
+    ('Nama:', 'nama'),
+    ('Usia:', 'usia'),
+    ('Program Studi:', 'programStudi'),
+    ('Angkatan:', 'angkatan'),
+    ('Jenis Kelamin:', 'jenisKelamin'),
+    ('Domisili:', 'domisili')
+]
+
+# (label, kunci report, ditulis sebagai merge B:H)
+ANALYSIS_FIELDS = [
+    ('Hipotesis:', 'hypothesisDescription', True),
+    ('Nilai CF:', 'cfValue', False),
+    ('Persentase CF:', 'cfPercentage', False),
+    ('Diagnosis:', 'diagnosis', True),
+    ('Rekomendasi:', 'recommendation', True)
+]
+
+DETAIL_HEADERS = ['No', 'Kode', 'Gejala', 'CF Expert', 'CF User', 'CF Kombinasi', 'Persentase']
+STEP_HEADERS = ['Langkah', 'Kode', 'CF Gejala', 'CF Sebelum', 'CF Sesudah', 'Formula']
+RULE_HEADERS = ['Rule', 'Status', 'Gejala Kurang']
+COLUMN_WIDTHS = [5, 10, 50, 12, 12, 15, 12]
+
+SUMMARY_HEADERS = ['No', 'Nama', 'Program Studi', 'Angkatan', 'Jenis Kelamin', 'Diagnosis', 'CF Value', 'CF (%)', 'Tanggal']
+SUMMARY_COLUMN_WIDTHS = [5, 25, 30, 10, 15, 40, 10, 10, 15]
+
+def compile_static_layout():
+    """
+    Sel statis laporan per responden sebagai daftar operasi
+    (jenis, baris awal, kolom awal, baris akhir, kolom akhir, teks, format).
+    """
+    ops = [
+        ('merge', 0, 0, 0, 7, 'LAPORAN HASIL ANALISIS KECANDUAN GAME ONLINE', 'title'),
+        ('merge', 1, 0, 1, 7, 'Sistem Pakar HEROin', 'title'),
+        ('merge', USER_ROW - 1, 0, USER_ROW - 1, 1, 'Informasi Pengguna:', 'bold')
+    ]
+    ops += [('write', USER_ROW + i, 0, None, None, label, 'bold') for i, (label, _) in enumerate(USER_FIELDS)]
+    ops.append(('merge', ANALYSIS_ROW - 1, 0, ANALYSIS_ROW - 1, 7, 'Hasil Analisis:', 'bold'))
+    ops += [('write', ANALYSIS_ROW + i, 0, None, None, label, 'bold') for i, (label, _, _) in enumerate(ANALYSIS_FIELDS)]
+    ops.append(('merge', DETAIL_ROW - 2, 0, DETAIL_ROW - 2, 7, 'Detail Gejala yang Teridentifikasi:', 'bold'))
+    ops += [('write', DETAIL_ROW, col, None, None, header, 'header') for col, header in enumerate(DETAIL_HEADERS)]
+    return ops
+
+STATIC_LAYOUT = compile_static_layout()
+
+class ReportTemplate:
+    """Format workbook yang dipakai ulang oleh semua worksheet di dalamnya"""
+    
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self.formats = {
+            'title': workbook.add_format({'bold': True, 'font_size': 16, 'align': 'center'}),
+            'summary_title': workbook.add_format({'bold': True, 'font_size': 14, 'align': 'center'}),
+            'header': workbook.add_format({'bold': True, 'bg_color': '#9630FB', 'color': 'white', 'border': 1}),
+            'cell': workbook.add_format({'border': 1}),
+            'bold': workbook.add_format({'bold': True})
+        }
+    
+    def write_report(self, worksheet, report):
+        """Menulis satu laporan responden (dengan 'trace') ke worksheet"""
+        formats = self.formats
+        cell = formats['cell']
+        header = formats['header']
+        
+        for kind, row, col, last_row, last_col, text, format_name in STATIC_LAYOUT:
+            if kind == 'merge':
+                worksheet.merge_range(row, col, last_row, last_col, text, formats[format_name])
+            else:
+                worksheet.write(row, col, text, formats[format_name])
+        
+        user = report['user']
+        for i, (_, key) in enumerate(USER_FIELDS):
+            worksheet.write(USER_ROW + i, 1, user[key])
+        
+        for i, (_, key, merged) in enumerate(ANALYSIS_FIELDS):
+            value = report[key]
+            if key == 'cfPercentage':
+                value = f'{value:.2f}%'
+            if merged:
+                worksheet.merge_range(ANALYSIS_ROW + i, 1, ANALYSIS_ROW + i, 7, value)
+            else:
+                worksheet.write(ANALYSIS_ROW + i, 1, value)
+        
+        # Isi tabel gejala
+        row = DETAIL_ROW
+        for i, detail in enumerate(report['symptomDetails']):
+            row += 1
+            worksheet.write_row(row, 0, [
+                i + 1,
+                detail['symptomCode'],
+                detail['symptomText'],
+                detail['cfExpert'],
+                detail['cfUser'],
+                detail['cfCombined'],
+                f"{detail['cfCombined'] * 100:.2f}%"
+            ], cell)
+        
+        # Penelusuran inferensi: langkah kombinasi CF dan evaluasi rule
+        trace = report['trace']
+        row += 2
+        worksheet.merge_range(row, 0, row, 7, 'Penelusuran Inferensi:', formats['bold'])
+        row += 1
+        worksheet.write_row(row, 0, STEP_HEADERS, header)
+        for step in trace['steps']:
+            row += 1
+            worksheet.write_row(row, 0, [
+                step['step'],
+                step['symptomCode'],
+                step['cfSymptom'],
+                step['cfBefore'] if step['cfBefore'] is not None else '-',
+                step['cfAfter'],
+                step['formula']
+            ], cell)
+        
+        row += 2
+        worksheet.write_row(row, 0, RULE_HEADERS, header)
+        for rule in trace['rules']:
+            row += 1
+            worksheet.write_row(row, 0, [
+                rule['ruleName'],
+                'Terpenuhi' if rule['matched'] else 'Tidak terpenuhi',
+                ', '.join(rule['missingSymptoms']) or '-'
+            ], cell)
+        
+        if trace['missingSymptoms']:
+            row += 2
+            worksheet.write(row, 0, 'Gejala tidak dijawab:', formats['bold'])
+            worksheet.write(row, 2, ', '.join(trace['missingSymptoms']))
+        
+        # Pengaturan lebar kolom
+        for i, width in enumerate(COLUMN_WIDTHS):
+            worksheet.set_column(i, i, width)
+    
+    def write_summary(self, worksheet, reports):
+        """Worksheet ringkasan: satu baris per result"""
+        formats = self.formats
+        cell = formats['cell']
+        
+        # Judul
+        worksheet.merge_range('A1:I1', 'RINGKASAN HASIL ANALISIS KECANDUAN GAME ONLINE', formats['summary_title'])
+        worksheet.merge_range('A2:I2', 'Sistem Pakar HEROin', formats['summary_title'])
+        
+        # Header tabel
+        row = 3
+        worksheet.write_row(row, 0, SUMMARY_HEADERS, formats['header'])
+        
+        # Isi tabel
+        for i, report in enumerate(reports):
+            user = report['user']
+            row += 1
+            worksheet.write_row(row, 0, [
+                i + 1,
+                user['nama'],
+                user['programStudi'],
+                user['angkatan'],
+                user['jenisKelamin'],
+                report['diagnosis'],
+                report['cfValue'],
+                f"{report['cfPercentage']:.2f}%",
+                report['createdAt'].strftime('%d-%m-%Y') if report['createdAt'] else ''
+            ], cell)
+        
+        # Pengaturan lebar kolom
+        for i, width in enumerate(SUMMARY_COLUMN_WIDTHS):
+            worksheet.set_column(i, i, width)
+
+def sheet_name(report):
+    return f"Hasil {report['resultId']}"
+
+def render_workbook(report):
+    """
+    Workbook satu responden (worksheet 'Hasil Analisis').
+    
+    Returns:
+        bytes: Isi file xlsx
+    """
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    ReportTemplate(workbook).write_report(workbook.add_worksheet('Hasil Analisis'), report)
+    workbook.close()
+    return output.getvalue()
+
+def render_workbooks(reports):
+    """Banyak workbook dalam satu process: menghasilkan (report, bytes xlsx)"""
+    for report in reports:
+        yield report, render_workbook(report)
+
+def render_combined(reports, details=True):
+    """
+    Satu workbook untuk banyak responden: worksheet 'Ringkasan' ditambah satu
+    worksheet per responden (jika details).
+    
+    Returns:
+        bytes: Isi file xlsx
+    """
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    template = ReportTemplate(workbook)
+    template.write_summary(workbook.add_worksheet('Ringkasan'), reports)
+    if details:
+        for report in reports:
+            template.write_report(workbook.add_worksheet(sheet_name(report)), report)
+    workbook.close()
+    return output.getvalue()
@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import text
+
+# Probe kesehatan untuk /readyz dan check_database.py: SELECT 1 lewat pool
+# aplikasi, keberadaan knowledge base dan saturasi pool. Hasil di-cache selama
+# ttl detik sehingga health check dari load balancer tidak menambah beban.
+
+class ProbeFailed(Exception):
+    """Probe gagal; details tetap dilaporkan bersama pesan error"""
+    
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details or {}
+
+def probe_database(engine):
+    """SELECT 1 memakai koneksi dari pool engine"""
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1')).scalar()
+    return {}
+
+def probe_knowledge_base(kb):
+    """Snapshot knowledge base aktif harus berisi hipotesis, gejala dan rule"""
+    details = {
+        'version': kb.version,
+        'hypotheses': len(kb.hypotheses),
+        'symptoms': len(kb.symptoms),
+        'rules': sum(len(rules) for rules in kb.rules.values())
+    }
+    empty = [name for name in ('hypotheses', 'symptoms', 'rules') if not details[name]]
+    if empty:
+        raise ProbeFailed(f"Knowledge base kosong: {', '.join(empty)} (jalankan migrations.sql)", details)
+    return details
+
+def probe_pool(pool, max_saturation=0.9):
+    """
+    Saturasi QueuePool: koneksi yang sedang dipakai dibanding kapasitas
+    (size + max_overflow). Gagal jika tidak ada koneksi tersisa.
+    """
+    if not hasattr(pool, 'checkedout'):
+        return {'pool': type(pool).__name__}
+    max_overflow = pool._max_overflow
+    checked_out = pool.checkedout()
+    details = {'size': pool.size(), 'checkedOut': checked_out, 'overflow': max(pool.overflow(), 0)}
+    if max_overflow < 0:
+        # Overflow tanpa batas: pool tidak pernah penuh
+        return details
+    capacity = pool.size() + max_overflow
+    details['capacity'] = capacity
+    details['saturation'] = round(checked_out / capacity, 3) if capacity else 1.0
+    if checked_out >= capacity:
+        raise ProbeFailed('Pool koneksi database penuh', details)
+    if details['saturation'] >= max_saturation:
+        details['warning'] = 'Pool koneksi hampir penuh'
+    return details
+
+class HealthChecker:
+    """
+    Menjalankan probe berurutan dan menyimpan laporannya selama ttl detik.
+    
+    Args:
+        probes (list): (nama, callable tanpa argumen yang mengembalikan dict
+            details, nama probe prasyarat atau None). Probe dilewati jika
+            prasyaratnya gagal.
+        ttl (float): Umur laporan yang dipakai ulang (detik)
+    """
+    
+    def __init__(self, probes, ttl=2.0, clock=time.monotonic):
+        self.probes = probes
+        self.ttl = ttl
+        self.clock = clock
+        self._report = None
+        self._checked = None
+        self._lock = threading.Lock()
+    
+    def run(self):
+        """Menjalankan semua probe sekarang (tanpa cache)"""
+        started = time.perf_counter()
+        results = {}
+        for name, probe, requires in self.probes:
+            if requires is not None and results[requires]['status'] != 'ok':
+                results[name] = {'status': 'skipped', 'reason': f"{requires} gagal"}
+                continue
+            probe_started = time.perf_counter()
+            try:
+                result = {'status': 'ok', **probe()}
+            except ProbeFailed as e:
+                result = {'status': 'fail', 'error': str(e), **e.details}
+            except Exception as e:
+                # Baris pertama saja; pesan SQLAlchemy menyertakan tautan dokumentasi
+                message = next(iter(str(e).splitlines()), '')
+                result = {'status': 'fail', 'error': f"{type(e).__name__}: {message}"}
+            result['latencyMs'] = round((time.perf_counter() - probe_started) * 1000, 2)
+            results[name] = result
+        
+        return {
+            'status': 'ok' if all(result['status'] == 'ok' for result in results.values()) else 'fail',
+            'checkedAt': datetime.utcnow().isoformat(),
+            'latencyMs': round((time.perf_counter() - started) * 1000, 2),
+            'probes': results
+        }
+    
+    def check(self):
+        """
+        Laporan terakhir jika umurnya belum melewati ttl; selain itu satu
+        thread menjalankan probe dan thread lain memakai hasilnya.
+        """
+        with self._lock:
+            now = self.clock()
+            if self._report is None or now - self._checked >= self.ttl:
+                self._report = self.run()
+                self._checked = self.clock()
+                now = self._checked
+            return dict(self._report, cached=now > self._checked, ageSeconds=round(now - self._checked, 3))
@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict
+from sqlalchemy import table, column, select, insert, delete, tuple_, DateTime
+
+# Kunci idempotensi submit kuesioner. Tabel result dipartisi per bulan sehingga
+# UNIQUE hanya bisa dipasang bersama created_at; kunci disimpan di tabel
+# submission_key terpisah (PRIMARY KEY (user_id, idempotency_key) -> result_id).
+# Kunci berlaku per user: kunci yang sama dari user lain adalah submit baru.
+MAX_KEY_LENGTH = 64
+
+submission_key_table = table('submission_key', column('user_id'), column('idempotency_key'),
+                             column('result_id'), column('created_at', DateTime))
+
+# Id result write-behind yang kalah balapan kunci -> result pemenang
+result_alias_table = table('result_alias', column('result_id'), column('target_id'))
+
+def find_result_id(connection, user_id, key):
+    """id result untuk kunci milik user, atau None"""
+    return connection.execute(
+        select(submission_key_table.c.result_id).where(
+            submission_key_table.c.user_id == user_id,
+            submission_key_table.c.idempotency_key == key
+        )
+    ).scalar()
+
+def find_existing_keys(connection, pairs):
+    """
+    Pasangan (user_id, kunci) yang sudah tersimpan di antara `pairs`.
+    
+    Returns:
+        dict: (user_id, kunci) -> result_id
+    """
+    if not pairs:
+        return {}
+    columns = (submission_key_table.c.user_id, submission_key_table.c.idempotency_key)
+    return {
+        (user_id, key): result_id for user_id, key, result_id in connection.execute(
+            select(*columns, submission_key_table.c.result_id).where(tuple_(*columns).in_(pairs))
+        )
+    }
+
+def record_keys(connection, rows):
+    """
+    Menyimpan pasangan kunci -> result. Tidak melakukan commit; kunci ganda
+    menimbulkan IntegrityError sehingga transaksi result ikut dibatalkan.
+    
+    Args:
+        rows (list): [{'user_id', 'idempotency_key', 'result_id', 'created_at'}, ...]
+    """
+    if rows:
+        connection.execute(insert(submission_key_table), rows)
+
+def delete_keys(connection, result_ids):
+    """Menghapus kunci (dan alias) milik result yang dihapus"""
+    connection.execute(delete(result_alias_table).where(result_alias_table.c.target_id.in_(result_ids)))
+    return connection.execute(
+        delete(submission_key_table).where(submission_key_table.c.result_id.in_(result_ids))
+    ).rowcount
+
+def find_aliases(connection, result_ids):
+    """
+    Returns:
+        dict: id alias -> id result tujuan, untuk id di `result_ids` yang merupakan alias
+    """
+    if not result_ids:
+        return {}
+    return dict(connection.execute(
+        select(result_alias_table.c.result_id, result_alias_table.c.target_id)
+        .where(result_alias_table.c.result_id.in_(result_ids))
+    ).all())
+
+def record_aliases(connection, rows):
+    """
+    Tidak melakukan commit.
+    
+    Args:
+        rows (list): [{'result_id', 'target_id'}, ...]
+    """
+    if rows:
+        connection.execute(insert(result_alias_table), rows)
+
+class IdempotencyCache:
+    """
+    Peta (user_id, kunci) -> result_id terbaru di memori proses (LRU dengan
+    batas max_entries) di depan tabel submission_key, beserta penghitung hit
+    duplikat untuk metrik.
+    """
+    
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.conflicts = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def put(self, key, result_id):
+        with self._lock:
+            self._entries[key] = result_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def lookup(self, key, load):
+        """
+        Mencari result untuk kunci: memori dulu, lalu load() (query database).
+        
+        Returns:
+            int: result_id asli jika kunci sudah pernah dipakai, atau None
+        """
+        with self._lock:
+            self.requests += 1
+            result_id = self._entries.get(key)
+            if result_id is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return result_id
+        
+        result_id = load()
+        if result_id is not None:
+            with self._lock:
+                self.database_hits += 1
+            self.put(key, result_id)
+        return result_id
+    
+    def evict_results(self, result_ids):
+        """Membuang kunci yang menunjuk ke result yang sudah dihapus"""
+        result_ids = {int(result_id) for result_id in result_ids}
+        with self._lock:
+            stale = [key for key, result_id in self._entries.items() if result_id in result_ids]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+    
+    def record_conflict(self):
+        """Submit bersamaan dengan kunci sama; yang kalah memakai result pemenang"""
+        with self._lock:
+            self.conflicts += 1
+    
+    def stats(self):
+        with self._lock:
+            duplicates = self.memory_hits + self.database_hits + self.conflicts
+            return {
+                'requestsWithKey': self.requests,
+                'duplicates': duplicates,
+                'memoryHits': self.memory_hits,
+                'databaseHits': self.database_hits,
+                'conflicts': self.conflicts,
+                'duplicateRate': duplicates / self.requests if self.requests else 0.0,
+                'cachedKeys': len(self._entries)
+            }
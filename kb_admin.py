@@ -0,0 +1,282 @@
+from sqlalchemy import select, insert, update, delete, and_
+import decision_table
+import knowledge_base
+from knowledge_base import hypothesis_table, symptom_table, question_table, rule_table, rule_symptom_table
+
+class KnowledgeBaseValidationError(ValueError):
+    """Batch edit knowledge base tidak valid; errors berisi semua pelanggaran"""
+    
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} kesalahan validasi knowledge base")
+        self.errors = errors
+
+def _text(item, key, path, errors):
+    value = item.get(key)
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"{path}.{key}: harus diisi")
+        return None
+    return value.strip()
+
+def _cf(item, key, path, errors, low=0.0, high=1.0):
+    try:
+        value = float(item[key])
+    except (KeyError, TypeError, ValueError):
+        errors.append(f"{path}.{key}: harus berupa angka")
+        return None
+    if not low <= value <= high:
+        errors.append(f"{path}.{key}: harus antara {low} dan {high}")
+        return None
+    return value
+
+def _find_cycles(edges):
+    """Siklus pada graf hipotesis -> hipotesis premis (DFS tiga warna)"""
+    cycles = []
+    state = {}
+    stack = []
+    
+    def visit(node):
+        state[node] = 1
+        stack.append(node)
+        for target in sorted(edges.get(node, ())):
+            if state.get(target) == 1:
+                cycles.append(stack[stack.index(target):] + [target])
+            elif target not in state:
+                visit(target)
+        stack.pop()
+        state[node] = 2
+    
+    for node in sorted(edges):
+        if node not in state:
+            visit(node)
+    return cycles
+
+def validate_batch(batch, snapshot):
+    """
+    Memvalidasi satu batch edit terhadap knowledge base saat ini. Semua
+    pelanggaran dikumpulkan sekaligus (bukan berhenti di kesalahan pertama).
+    
+    Format batch (semua bagian opsional, kunci upsert adalah code/ruleName):
+        {
+            "hypotheses": [{"code", "name", "description", "cfThresholdMin", "cfThresholdMax"}],
+            "symptoms": [{"code", "description", "cfExpert", "question"}],
+            "rules": [{"hypothesis": "P1", "ruleName", "description", "symptoms": ["G1", 3, ...]}]
+        }
+    
+    Premis rule boleh berupa id atau kode gejala.
+    
+    Returns:
+        dict: Batch yang sudah dinormalisasi
+    
+    Raises:
+        KnowledgeBaseValidationError: Jika ada pelanggaran
+    """
+    errors = []
+    if not isinstance(batch, dict):
+        raise KnowledgeBaseValidationError(['batch harus berupa objek JSON'])
+    
+    sections = {}
+    for section in ('hypotheses', 'symptoms', 'rules'):
+        items = batch.get(section, [])
+        if not isinstance(items, list):
+            errors.append(f"{section}: harus berupa list")
+            items = []
+        sections[section] = items
+    
+    hypotheses = {}
+    for i, item in enumerate(sections['hypotheses']):
+        path = f"hypotheses[{i}]"
+        if not isinstance(item, dict):
+            errors.append(f"{path}: harus berupa objek")
+            continue
+        code = _text(item, 'code', path, errors)
+        row = {
+            'code': code,
+            'name': _text(item, 'name', path, errors),
+            'description': _text(item, 'description', path, errors),
+            'cf_threshold_min': _cf(item, 'cfThresholdMin', path, errors),
+            'cf_threshold_max': _cf(item, 'cfThresholdMax', path, errors)
+        }
+        if None not in (row['cf_threshold_min'], row['cf_threshold_max']) \
+                and row['cf_threshold_min'] > row['cf_threshold_max']:
+            errors.append(f"{path}: cfThresholdMin lebih besar dari cfThresholdMax")
+        if code in hypotheses:
+            errors.append(f"{path}.code: hipotesis {code} muncul lebih dari sekali dalam batch")
+        elif code:
+            hypotheses[code] = row
+    
+    symptoms = {}
+    for i, item in enumerate(sections['symptoms']):
+        path = f"symptoms[{i}]"
+        if not isinstance(item, dict):
+            errors.append(f"{path}: harus berupa objek")
+            continue
+        code = _text(item, 'code', path, errors)
+        row = {
+            'code': code,
+            'description': _text(item, 'description', path, errors),
+            'cf_expert': _cf(item, 'cfExpert', path, errors),
+            'question': _text(item, 'question', path, errors) if 'question' in item else None
+        }
+        if code in symptoms:
+            errors.append(f"{path}.code: gejala {code} muncul lebih dari sekali dalam batch")
+        elif code:
+            symptoms[code] = row
+    
+    # Kode yang dikenal setelah batch diterapkan
+    hypothesis_codes = {h['code'] for h in snapshot.hypotheses.values()} | set(hypotheses)
+    symptom_code_of = {symptom[0]: symptom[1] for symptom in snapshot.symptoms.values()}
+    symptom_codes = set(symptom_code_of.values()) | set(symptoms)
+    
+    rules = {}
+    for i, item in enumerate(sections['rules']):
+        path = f"rules[{i}]"
+        if not isinstance(item, dict):
+            errors.append(f"{path}: harus berupa objek")
+            continue
+        hypothesis = _text(item, 'hypothesis', path, errors)
+        rule_name = _text(item, 'ruleName', path, errors)
+        if hypothesis and hypothesis not in hypothesis_codes:
+            errors.append(f"{path}.hypothesis: hipotesis {hypothesis} tidak ditemukan")
+        
+        premises = item.get('symptoms')
+        if not isinstance(premises, list) or not premises:
+            errors.append(f"{path}.symptoms: minimal satu gejala")
+            premises = []
+        
+        codes = []
+        for j, ref in enumerate(premises):
+            if isinstance(ref, int) and not isinstance(ref, bool):
+                code = symptom_code_of.get(ref)
+                if code is None:
+                    errors.append(f"{path}.symptoms[{j}]: gejala id {ref} tidak ditemukan")
+                    continue
+            elif isinstance(ref, str) and (ref in symptom_codes or ref in hypothesis_codes):
+                code = ref
+            else:
+                errors.append(f"{path}.symptoms[{j}]: gejala {ref!r} tidak ditemukan")
+                continue
+            if code in codes:
+                errors.append(f"{path}.symptoms[{j}]: gejala {code} disebut dua kali")
+                continue
+            codes.append(code)
+        
+        key = (hypothesis, rule_name)
+        if key in rules:
+            errors.append(f"{path}.ruleName: rule {rule_name} untuk {hypothesis} muncul lebih dari sekali dalam batch")
+        elif hypothesis and rule_name:
+            rules[key] = {
+                'path': path,
+                'hypothesis': hypothesis,
+                'rule_name': rule_name,
+                'description': item.get('description'),
+                'symptoms': codes
+            }
+    
+    # Rule akhir per hipotesis: rule lama yang tidak ditimpa batch + rule batch
+    final_rules = {}
+    for hypothesis_id, hypothesis_rules in snapshot.rules.items():
+        hypothesis = snapshot.hypotheses[hypothesis_id]['code']
+        for rule_name, symptom_ids in hypothesis_rules:
+            if (hypothesis, rule_name) not in rules:
+                premises = frozenset(symptom_code_of.get(s) for s in symptom_ids)
+                final_rules.setdefault(hypothesis, []).append((f"rule {rule_name}", premises))
+    for rule in rules.values():
+        final_rules.setdefault(rule['hypothesis'], []).append((rule['path'], frozenset(rule['symptoms'])))
+    
+    # Rule duplikat: premis identik untuk hipotesis yang sama
+    for hypothesis, hypothesis_rules in final_rules.items():
+        seen = {}
+        for label, premises in hypothesis_rules:
+            if premises in seen:
+                errors.append(f"{label}: premis sama dengan {seen[premises]} untuk hipotesis {hypothesis}")
+            else:
+                seen[premises] = label
+    
+    # Ukuran per hipotesis dibatasi sama dengan tabel keputusan; hipotesis yang
+    # lebih besar membuat kompilasi saat reload di setiap worker tidak praktis
+    for hypothesis, hypothesis_rules in sorted(final_rules.items()):
+        symptom_count = len({code for _, premises in hypothesis_rules for code in premises if code in symptom_codes})
+        error = decision_table.limit_error(symptom_count, len(hypothesis_rules))
+        if error:
+            errors.append(f"hipotesis {hypothesis}: {error}")
+    
+    # Premis berupa hipotesis membentuk rantai antar rule; siklus ditolak, dan
+    # rantai tanpa siklus pun belum didukung mesin inferensi (satu tingkat)
+    edges = {
+        hypothesis: {
+            code for _, premises in hypothesis_rules for code in premises
+            if code in hypothesis_codes and code not in symptom_codes
+        }
+        for hypothesis, hypothesis_rules in final_rules.items()
+    }
+    for cycle in _find_cycles(edges):
+        errors.append(f"siklus rule: {' -> '.join(cycle)}")
+    for rule in rules.values():
+        chained = [code for code in rule['symptoms'] if code in hypothesis_codes and code not in symptom_codes]
+        if chained:
+            errors.append(f"{rule['path']}.symptoms: premis hipotesis {', '.join(chained)} belum didukung")
+    
+    if errors:
+        raise KnowledgeBaseValidationError(errors)
+    return {'hypotheses': hypotheses, 'symptoms': symptoms, 'rules': rules}
+
+def _upsert(connection, tbl, key_filter, values, counts):
+    """Update baris yang cocok dengan key_filter atau insert baru; mengembalikan id"""
+    row_id = connection.execute(select(tbl.c.id).where(key_filter)).scalar()
+    if row_id is None:
+        row_id = connection.execute(insert(tbl).values(**values)).lastrowid
+        counts['inserted'] += 1
+    else:
+        connection.execute(update(tbl).where(tbl.c.id == row_id).values(**values))
+        counts['updated'] += 1
+    return row_id
+
+def apply_batch(connection, batch, snapshot):
+    """
+    Memvalidasi lalu menulis batch dalam transaksi pemanggil dan menaikkan
+    kb_version. Tidak melakukan commit.
+    
+    Returns:
+        dict: Jumlah baris yang di-insert/update per bagian
+    
+    Raises:
+        KnowledgeBaseValidationError: Jika batch tidak valid (tidak ada yang ditulis)
+    """
+    batch = validate_batch(batch, snapshot)
+    changes = {section: {'inserted': 0, 'updated': 0} for section in ('hypotheses', 'symptoms', 'rules')}
+    
+    for code, row in batch['hypotheses'].items():
+        _upsert(connection, hypothesis_table, hypothesis_table.c.code == code, row, changes['hypotheses'])
+    
+    for code, row in batch['symptoms'].items():
+        question = row.pop('question')
+        symptom_id = _upsert(connection, symptom_table, symptom_table.c.code == code, row, changes['symptoms'])
+        if question:
+            # Pertanyaan pertama gejala (yang ditampilkan) diganti, atau dibuat jika belum ada
+            question_id = connection.execute(
+                select(question_table.c.id).where(question_table.c.symptom_id == symptom_id)
+                .order_by(question_table.c.id).limit(1)
+            ).scalar()
+            if question_id is None:
+                connection.execute(insert(question_table).values(symptom_id=symptom_id, text=question))
+            else:
+                connection.execute(update(question_table).where(question_table.c.id == question_id).values(text=question))
+    
+    hypothesis_ids = dict(connection.execute(select(hypothesis_table.c.code, hypothesis_table.c.id)).all())
+    symptom_ids = dict(connection.execute(select(symptom_table.c.code, symptom_table.c.id)).all())
+    for rule in batch['rules'].values():
+        hypothesis_id = hypothesis_ids[rule['hypothesis']]
+        rule_id = _upsert(
+            connection, rule_table,
+            and_(rule_table.c.hypothesis_id == hypothesis_id, rule_table.c.rule_name == rule['rule_name']),
+            {'hypothesis_id': hypothesis_id, 'rule_name': rule['rule_name'], 'description': rule['description']},
+            changes['rules']
+        )
+        # Premis rule diganti seluruhnya
+        connection.execute(delete(rule_symptom_table).where(rule_symptom_table.c.rule_id == rule_id))
+        connection.execute(insert(rule_symptom_table), [
+            {'rule_id': rule_id, 'symptom_id': symptom_ids[code]} for code in rule['symptoms']
+        ])
+    
+    knowledge_base.bump_version(connection)
+    return changes
@@ -0,0 +1,169 @@
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from decision_table import DecisionTable
+
+# Format image: MAGIC, panjang header (uint32), header JSON, lalu section data
+# yang disejajarkan 8 byte. Header berisi offset/panjang/typecode tiap section
+# plus metadata kecil (gejala, nama rule, outcome) per hipotesis.
+MAGIC = b'HKB1'
+PREFIX = struct.Struct('<4sI')
+ALIGN = 8
+# Dinaikkan jika isi section berubah untuk KB yang sama (misal urutan gejala
+# tabel keputusan), agar image lama tidak dipetakan ulang
+LAYOUT = 2
+
+def fingerprint(snapshot):
+    """Ringkasan isi snapshot; membedakan image jika KB diubah tanpa menaikkan kb_version"""
+    content = json.dumps([
+        LAYOUT,
+        snapshot.hypothesis_list,
+        sorted(snapshot.symptoms.values()),
+        sorted(snapshot.rules.items()),
+        sorted(snapshot.questions_by_symptom.items())
+    ], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+
+def image_path(directory, snapshot):
+    return os.path.join(directory, f"kb-{snapshot.version}-{fingerprint(snapshot)}.img")
+
+def image_version(path):
+    try:
+        return int(os.path.basename(path).split('-')[1])
+    except (IndexError, ValueError):
+        return None
+
+class ImageWriter:
+    """Menyusun section image di memori lalu menulisnya sekaligus"""
+    
+    def __init__(self):
+        self.sections = {}
+        self.chunks = []
+        self.size = 0
+    
+    def add(self, name, data, typecode='B'):
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        self.sections[name] = (self.size, len(raw), typecode)
+        padding = -len(raw) % ALIGN
+        self.chunks.append(raw + b'\0' * padding)
+        self.size += len(raw) + padding
+    
+    def write(self, path, header):
+        header['sections'] = self.sections
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        header_bytes += b' ' * (-(PREFIX.size + len(header_bytes)) % ALIGN)
+        
+        # Tulis ke file sementara lalu rename: worker lain tidak pernah melihat image setengah jadi
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(PREFIX.pack(MAGIC, len(header_bytes)))
+            f.write(header_bytes)
+            for chunk in self.chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+def write_image(path, snapshot, dumps):
+    """
+    Mengompilasi snapshot ke file image: tabel keputusan per hipotesis (yang
+    muat dalam batas ukuran) dan payload JSON /api/hypotheses serta
+    /api/questions. Hanya section yang dibaca worker yang ditulis; dict
+    snapshot yang kecil (hipotesis, gejala, rule) tetap dibuat per worker.
+    
+    Args:
+        path (str): File tujuan
+        snapshot (KnowledgeBase): Snapshot yang dikompilasi
+        dumps (callable): Serializer JSON yang sama dengan jsonify
+    """
+    writer = ImageWriter()
+    for name, payload in snapshot.static_payloads(dumps):
+        writer.add(f"payload/{name}", payload)
+    
+    hypotheses = {}
+    for hypothesis_id in snapshot.hypotheses:
+        table = snapshot.decision_table(hypothesis_id)
+        if table is None:
+            # Melewati batas ukuran tabel: skor live
+            continue
+        writer.add(f"cf_values/{hypothesis_id}", table.cf_values, table.cf_values.typecode)
+        writer.add(f"matched/{hypothesis_id}", table.matched, table.matched.typecode)
+        writer.add(f"outcome_codes/{hypothesis_id}", table.outcome_codes, table.outcome_codes.typecode)
+        hypotheses[hypothesis_id] = {
+            'symptoms': list(table.symptoms.values()),
+            'ruleNames': table.rule_names,
+            'outcomes': table.outcomes
+        }
+    
+    writer.write(path, {'version': snapshot.version, 'hypotheses': hypotheses})
+
+class MappedKnowledgeBase:
+    """
+    Image knowledge base yang di-mmap read-only. Semua worker pada satu mesin
+    memetakan file yang sama sehingga halaman memorinya dibagi oleh kernel;
+    section diakses sebagai memoryview tanpa salinan.
+    """
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len = PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} bukan image knowledge base")
+        header = json.loads(bytes(self._map[PREFIX.size:PREFIX.size + header_len]))
+        self.path = path
+        self.version = header['version']
+        self._base = PREFIX.size + header_len
+        self._sections = header['sections']
+        self._view = memoryview(self._map)
+        
+        self.decision_tables = {
+            int(hypothesis_id): DecisionTable.from_buffers(
+                int(hypothesis_id),
+                [tuple(symptom) for symptom in meta['symptoms']],
+                meta['ruleNames'],
+                [tuple(outcome) for outcome in meta['outcomes']],
+                self.section(f"cf_values/{hypothesis_id}"),
+                self.section(f"matched/{hypothesis_id}"),
+                self.section(f"outcome_codes/{hypothesis_id}")
+            )
+            for hypothesis_id, meta in header['hypotheses'].items()
+        }
+    
+    def section(self, name):
+        """memoryview ke section (di-cast sesuai typecode), atau None jika tidak ada"""
+        entry = self._sections.get(name)
+        if entry is None:
+            return None
+        offset, length, typecode = entry
+        view = self._view[self._base + offset:self._base + offset + length]
+        return view if typecode == 'B' else view.cast(typecode)
+    
+    def payload(self, name):
+        """Payload JSON yang sudah diserialisasi (bytes), atau None"""
+        view = self.section(f"payload/{name}")
+        return bytes(view) if view is not None else None
+
+def attach(directory, snapshot, dumps):
+    """
+    Memetakan image untuk snapshot; worker pertama yang tidak menemukannya
+    menulis image tersebut, worker berikutnya langsung memetakan. Image versi
+    lebih lama dihapus (worker yang masih memetakannya tidak terganggu).
+    
+    Returns:
+        MappedKnowledgeBase
+    """
+    path = image_path(directory, snapshot)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        write_image(path, snapshot, dumps)
+        for old_path in glob.glob(os.path.join(directory, 'kb-*.img')):
+            old_version = image_version(old_path)
+            if old_version is not None and old_version < snapshot.version:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+    return MappedKnowledgeBase(path)
@@ -0,0 +1,264 @@
+import threading
+import time
+from sqlalchemy import table, column, select, update
+from sqlalchemy.exc import SQLAlchemyError
+import diagnosis_index
+import decision_table
+
+# Tabel knowledge base (skema migrations.sql)
+hypothesis_table = table('hypothesis', column('id'), column('code'), column('name'), column('description'),
+                         column('cf_threshold_min'), column('cf_threshold_max'))
+symptom_table = table('symptom', column('id'), column('code'), column('description'), column('cf_expert'))
+question_table = table('question', column('id'), column('symptom_id'), column('text'))
+rule_table = table('rule', column('id'), column('hypothesis_id'), column('rule_name'), column('description'))
+rule_symptom_table = table('rule_symptom', column('id'), column('rule_id'), column('symptom_id'))
+kb_version_table = table('kb_version', column('id'), column('version'))
+
+class KnowledgeBase:
+    """
+    Snapshot knowledge base yang sudah dikompilasi untuk satu kb_version.
+    Snapshot tidak pernah diubah setelah dibuat; reload membuat snapshot baru
+    lalu mengganti referensinya.
+    """
+    
+    def __init__(self, version, hypotheses, symptoms, questions, rules):
+        """
+        Args:
+            version (int): Nilai kb_version saat snapshot dibaca
+            hypotheses (list): (id, code, name, description, cf_threshold_min, cf_threshold_max)
+            symptoms (list): (id, code, description, cf_expert)
+            questions (list): (id, symptom_id, text), urut id
+            rules (list): (rule_id, hypothesis_id, rule_name, symptom_id), urut rule lalu rule_symptom
+        """
+        self.version = version
+        self.hypotheses = {
+            h[0]: {
+                'id': h[0],
+                'code': h[1],
+                'name': h[2],
+                'description': h[3],
+                'cfThresholdMin': h[4],
+                'cfThresholdMax': h[5]
+            }
+            for h in sorted(hypotheses)
+        }
+        self.hypothesis_list = list(self.hypotheses.values())
+        self.symptoms = {s[0]: tuple(s) for s in symptoms}
+        
+        # Pertanyaan pertama untuk setiap gejala, dalam format Question.to_dict
+        self.questions_by_symptom = {}
+        for question_id, symptom_id, text in questions:
+            if symptom_id not in self.questions_by_symptom:
+                symptom = self.symptoms.get(symptom_id)
+                self.questions_by_symptom[symptom_id] = {
+                    'id': question_id,
+                    'symptomId': symptom_id,
+                    'text': text,
+                    'symptomCode': symptom[1] if symptom else None
+                }
+        
+        # Rule per hipotesis: [(rule_name, [symptom_id, ...]), ...]
+        self.rules = {}
+        grouped = {}
+        for rule_id, hypothesis_id, rule_name, symptom_id in rules:
+            if rule_id not in grouped:
+                grouped[rule_id] = (rule_name, [])
+                self.rules.setdefault(hypothesis_id, []).append(grouped[rule_id])
+            if symptom_id is not None:
+                grouped[rule_id][1].append(symptom_id)
+        
+        # Gejala yang diperlukan per hipotesis, urut kemunculan dalam rantai rule
+        self.required_symptoms = {
+            hypothesis_id: list(dict.fromkeys(s for _, symptom_ids in hypothesis_rules for s in symptom_ids))
+            for hypothesis_id, hypothesis_rules in self.rules.items()
+        }
+        # Posisi gejala dalam urutan kanonik (urut id, sama dengan urutan pertanyaan
+        # dan tabel keputusan): urutan kombinasi CF pada semua jalur scoring
+        self.symptom_positions = {
+            hypothesis_id: {symptom_id: i for i, symptom_id in enumerate(sorted(symptom_ids))}
+            for hypothesis_id, symptom_ids in self.required_symptoms.items()
+        }
+        
+        self.threshold_index = diagnosis_index.ThresholdIndex([(h[1], h[2], h[3], h[4]) for h in hypotheses]) \
+            if hypotheses else diagnosis_index.ThresholdIndex.default()
+        self._decision_tables = {}
+        self._lock = threading.Lock()
+        self.image = None
+        self.payloads = {}
+    
+    def attach_image(self, image):
+        """
+        Memakai image bersama (kb_mmap.MappedKnowledgeBase): tabel keputusan
+        dan payload JSON dibaca dari mmap, salinan privat dilepas.
+        """
+        self.image = image
+        self._decision_tables = dict(image.decision_tables)
+    
+    def questions_for_hypothesis(self, hypothesis_id):
+        """Pertanyaan untuk gejala yang diperlukan hipotesis (backward chaining)"""
+        return [
+            self.questions_by_symptom[symptom_id]
+            for symptom_id in sorted(self.required_symptoms.get(hypothesis_id, []))
+            if symptom_id in self.questions_by_symptom
+        ]
+    
+    def static_payloads(self, dumps):
+        """Payload JSON /api/hypotheses dan /api/questions/<id>: (nama, bytes)"""
+        yield 'hypotheses', (dumps(self.hypothesis_list) + '\n').encode('utf-8')
+        for hypothesis_id in self.hypotheses:
+            yield f"questions/{hypothesis_id}", (dumps(self.questions_for_hypothesis(hypothesis_id)) + '\n').encode('utf-8')
+    
+    def compile_payloads(self, dumps):
+        """Menserialisasi payload statis sekali per snapshot (tanpa image mmap)"""
+        self.payloads = dict(self.static_payloads(dumps))
+    
+    def payload(self, name):
+        """Payload JSON yang sudah diserialisasi (dari image atau compile_payloads), atau None"""
+        if self.image is not None:
+            return self.image.payload(name)
+        return self.payloads.get(name)
+    
+    def compile_decision_tables(self):
+        """Membangun tabel keputusan semua hipotesis sebelum snapshot dipasang"""
+        for hypothesis_id in self.hypotheses:
+            self.decision_table(hypothesis_id)
+    
+    def decision_table(self, hypothesis_id):
+        """
+        Tabel keputusan hipotesis, dibangun sekali per snapshot, atau None jika
+        hipotesis melewati batas ukuran (skor live oleh BackwardChaining)
+        """
+        try:
+            return self._decision_tables[hypothesis_id]
+        except KeyError:
+            pass
+        with self._lock:
+            if hypothesis_id not in self._decision_tables:
+                self._decision_tables[hypothesis_id] = self.build_decision_table(hypothesis_id)
+            return self._decision_tables[hypothesis_id]
+    
+    def build_decision_table(self, hypothesis_id):
+        symptoms = [self.symptoms[s] for s in sorted(self.required_symptoms.get(hypothesis_id, [])) if s in self.symptoms]
+        rules = self.rules.get(hypothesis_id, [])
+        if decision_table.limit_error(len(symptoms), len(rules)):
+            return None
+        index = self.threshold_index
+        return decision_table.DecisionTable(
+            hypothesis_id,
+            symptoms,
+            rules,
+            lambda cf_value: index.classify(cf_value * 100).as_tuple
+        )
+
+def read_version(connection):
+    """Nilai kb_version saat ini (0 jika tabel/baris belum ada)"""
+    try:
+        version = connection.execute(
+            select(kb_version_table.c.version).where(kb_version_table.c.id == 1)
+        ).scalar()
+    except SQLAlchemyError:
+        return 0
+    return version or 0
+
+def bump_version(connection):
+    """Menaikkan kb_version; dipanggil dalam transaksi yang mengubah knowledge base"""
+    connection.execute(
+        update(kb_version_table).where(kb_version_table.c.id == 1)
+        .values(version=kb_version_table.c.version + 1)
+    )
+
+def fetch_rows(connection):
+    """Membaca seluruh knowledge base (4 query kecil) dalam format argumen KnowledgeBase"""
+    hypotheses = connection.execute(select(
+        hypothesis_table.c.id, hypothesis_table.c.code, hypothesis_table.c.name, hypothesis_table.c.description,
+        hypothesis_table.c.cf_threshold_min, hypothesis_table.c.cf_threshold_max
+    )).all()
+    symptoms = connection.execute(select(
+        symptom_table.c.id, symptom_table.c.code, symptom_table.c.description, symptom_table.c.cf_expert
+    )).all()
+    questions = connection.execute(
+        select(question_table.c.id, question_table.c.symptom_id, question_table.c.text).order_by(question_table.c.id)
+    ).all()
+    rules = connection.execute(
+        select(rule_table.c.id, rule_table.c.hypothesis_id, rule_table.c.rule_name, rule_symptom_table.c.symptom_id)
+        .select_from(rule_table)
+        .outerjoin(rule_symptom_table, rule_symptom_table.c.rule_id == rule_table.c.id)
+        .order_by(rule_table.c.id, rule_symptom_table.c.id)
+    ).all()
+    return hypotheses, symptoms, questions, rules
+
+def load_snapshot(connection, version=None):
+    """Membaca knowledge base lalu mengompilasinya menjadi snapshot"""
+    if version is None:
+        version = read_version(connection)
+    return KnowledgeBase(version, *fetch_rows(connection))
+
+class KnowledgeBaseCache:
+    """
+    Snapshot knowledge base per proses dengan hot reload.
+    
+    Paling sering sekali setiap check_interval detik, get() membaca satu baris
+    kb_version. Jika versinya berubah, snapshot baru dimuat dan dikompilasi
+    lalu referensinya diganti secara atomik; request yang sedang berjalan
+    tetap memakai snapshot lama sampai selesai. Pembacaan tidak memakai lock.
+    """
+    
+    def __init__(self, check_interval=2.0, prepare=None, clock=time.monotonic):
+        """
+        Args:
+            check_interval (float): Jeda minimum (detik) antar pemeriksaan kb_version
+            prepare (callable): Dipanggil dengan snapshot baru sebelum dipasang,
+                misal untuk mengompilasi tabel keputusan di luar jalur request lain
+        """
+        self.check_interval = check_interval
+        self.prepare = prepare
+        self.clock = clock
+        self.snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def get(self, connection):
+        snapshot = self.snapshot
+        if snapshot is not None and self.clock() - self._checked_at < self.check_interval:
+            return snapshot
+        
+        with self._lock:
+            if self.snapshot is not None and self.clock() - self._checked_at < self.check_interval:
+                return self.snapshot
+            version = read_version(connection)
+            if self.snapshot is None or self.snapshot.version != version:
+                self.swap(load_snapshot(connection, version))
+            self._checked_at = self.clock()
+            return self.snapshot
+    
+    def reload(self, connection):
+        """
+        Memuat ulang dan memasang snapshot sekarang juga (tanpa menunggu
+        interval), misal setelah knowledge base diedit lewat API admin.
+        
+        Returns:
+            tuple: (snapshot, {'loadMs': ..., 'compileMs': ...})
+        """
+        with self._lock:
+            started = time.perf_counter()
+            version = read_version(connection)
+            rows = fetch_rows(connection)
+            loaded = time.perf_counter()
+            snapshot = KnowledgeBase(version, *rows)
+            self.swap(snapshot)
+            self._checked_at = self.clock()
+            compiled = time.perf_counter()
+        return snapshot, {
+            'loadMs': round((loaded - started) * 1000, 3),
+            'compileMs': round((compiled - loaded) * 1000, 3)
+        }
+    
+    def swap(self, snapshot):
+        if self.prepare:
+            self.prepare(snapshot)
+        self.snapshot = snapshot
+        diagnosis_index.install(snapshot.threshold_index)
+    
+    def invalidate(self):
+        """Memaksa pemeriksaan versi pada get() berikutnya"""
+        self._checked_at = 0.0
@@ -9,12 +9,14 @@ USE heroin_db;
 CREATE TABLE IF NOT EXISTS user (
     id INT AUTO_INCREMENT PRIMARY KEY,
     nama VARCHAR(100) NOT NULL,
+    nama_key VARCHAR(120) NOT NULL, -- Nama ter-normalisasi untuk lookup/upsert
     usia INT NOT NULL,
     angkatan VARCHAR(10) NOT NULL,
     program_studi VARCHAR(100) NOT NULL,
     domisili VARCHAR(100) NOT NULL,
     jenis_kelamin VARCHAR(10) NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_user_nama_key (nama_key)
 );
 
 -- Buat tabel hypothesis (Updated)
@@ -71,6 +73,12 @@ CREATE TABLE IF NOT EXISTS result (
     diagnosis TEXT NOT NULL,
     recommendation TEXT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Dimensi agregat harian saat submit (lihat rollups.py)
+    rollup_program_studi VARCHAR(100) NULL,
+    rollup_angkatan VARCHAR(10) NULL,
+    rollup_jenis_kelamin VARCHAR(10) NULL,
+    rollup_level TINYINT NULL,
+    INDEX idx_result_created_at (created_at),
     FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE CASCADE,
     FOREIGN KEY (hypothesis_id) REFERENCES hypothesis(id) ON DELETE CASCADE
 );
@@ -82,10 +90,68 @@ CREATE TABLE IF NOT EXISTS answer (
     symptom_id INT NOT NULL,
     cf_user FLOAT NOT NULL, -- Nilai dari user (0.0 - 1.0)
     cf_combined FLOAT NOT NULL, -- CF_expert * CF_user
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- Sama dengan result.created_at
     FOREIGN KEY (result_id) REFERENCES result(id) ON DELETE CASCADE,
     FOREIGN KEY (symptom_id) REFERENCES symptom(id) ON DELETE CASCADE
 );
 
+-- Buat tabel daily_rollup - agregat harian untuk endpoint tren
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    day DATE NOT NULL,
+    program_studi VARCHAR(100) NOT NULL,
+    angkatan VARCHAR(10) NOT NULL,
+    jenis_kelamin VARCHAR(10) NOT NULL,
+    result_count INT NOT NULL DEFAULT 0,
+    cf_percentage_sum DOUBLE NOT NULL DEFAULT 0,
+    p0_count INT NOT NULL DEFAULT 0, -- CF < 40%
+    p1_count INT NOT NULL DEFAULT 0, -- 40% <= CF < 61%
+    p2_count INT NOT NULL DEFAULT 0, -- 61% <= CF < 81%
+    p3_count INT NOT NULL DEFAULT 0, -- CF >= 81%
+    UNIQUE KEY uq_daily_rollup (day, program_studi, angkatan, jenis_kelamin)
+);
+
+-- Buat tabel admins - akun untuk API edit knowledge base
+CREATE TABLE IF NOT EXISTS admins (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    password_hash VARCHAR(256) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Buat tabel kb_version - versi knowledge base untuk hot reload worker
+CREATE TABLE IF NOT EXISTS kb_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1
+);
+
+INSERT IGNORE INTO kb_version (id, version) VALUES (1, 1);
+
+-- Buat tabel result_id_block - blok id result untuk mode write-behind
+CREATE TABLE IF NOT EXISTS result_id_block (
+    id INT PRIMARY KEY,
+    next_id BIGINT NOT NULL
+);
+
+INSERT IGNORE INTO result_id_block (id, next_id) VALUES (1, 1);
+
+-- Buat tabel submission_key - kunci idempotensi submit kuesioner
+CREATE TABLE IF NOT EXISTS submission_key (
+    user_id INT NOT NULL,
+    idempotency_key VARCHAR(64) NOT NULL,
+    result_id INT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, idempotency_key),
+    INDEX idx_submission_key_result (result_id)
+);
+
+-- Buat tabel result_alias - id result write-behind yang digabung ke result lain
+CREATE TABLE IF NOT EXISTS result_alias (
+    result_id INT PRIMARY KEY,
+    target_id INT NOT NULL,
+    INDEX idx_result_alias_target (target_id)
+);
+
 -- Insert data hypothesis
 INSERT INTO hypothesis (code, name, description, cf_threshold_min, cf_threshold_max) VALUES
 ('P1', 'Kecanduan Ringan', 'Kecanduan game online tingkat ringan dengan durasi bermain 2-4 jam/hari', 0.40, 0.60),
@@ -168,4 +234,21 @@ INSERT INTO question (symptom_id, text) VALUES
 (9, 'Apakah Anda mengorbankan hubungan, pekerjaan, atau studi demi bermain game?'),
 (10, 'Apakah Anda lebih memilih berinteraksi sosial di dalam game daripada di dunia nyata?'),
 (11, 'Apakah Anda mengalami masalah fisik seperti kelelahan, sakit mata, kurang tidur, atau lupa makan karena bermain game?'),
-(12, 'Apakah prestasi akademik atau kinerja Anda menurun karena bermain game?');
\ No newline at end of file
+(12, 'Apakah prestasi akademik atau kinerja Anda menurun karena bermain game?');
+
+-- Trigger: setiap perubahan knowledge base menaikkan kb_version
+CREATE TRIGGER trg_hypothesis_ai_kb_version AFTER INSERT ON `hypothesis` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_hypothesis_au_kb_version AFTER UPDATE ON `hypothesis` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_hypothesis_ad_kb_version AFTER DELETE ON `hypothesis` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_symptom_ai_kb_version AFTER INSERT ON `symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_symptom_au_kb_version AFTER UPDATE ON `symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_symptom_ad_kb_version AFTER DELETE ON `symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_ai_kb_version AFTER INSERT ON `rule` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_au_kb_version AFTER UPDATE ON `rule` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_ad_kb_version AFTER DELETE ON `rule` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_symptom_ai_kb_version AFTER INSERT ON `rule_symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_symptom_au_kb_version AFTER UPDATE ON `rule_symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_symptom_ad_kb_version AFTER DELETE ON `rule_symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_question_ai_kb_version AFTER INSERT ON `question` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_question_au_kb_version AFTER UPDATE ON `question` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_question_ad_kb_version AFTER DELETE ON `question` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
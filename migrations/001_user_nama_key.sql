@@ -0,0 +1,46 @@
+-- 001_user_nama_key.sql
+-- Upgrade database lama: kolom nama_key ter-normalisasi dengan UNIQUE index
+-- untuk lookup dan upsert user (INSERT ... ON DUPLICATE KEY UPDATE).
+
+USE heroin_db;
+
+-- Database yang dibuat dari migrations.sql versi terbaru sudah memiliki
+-- nama_key dan uq_user_nama_key; keduanya hanya ditambahkan jika belum ada
+-- (MySQL tidak mendukung ADD COLUMN/INDEX IF NOT EXISTS).
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.columns
+     WHERE table_schema = DATABASE() AND table_name = 'user' AND column_name = 'nama_key') = 0,
+    'ALTER TABLE user ADD COLUMN nama_key VARCHAR(120) NULL AFTER nama',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Isi nama_key dengan aturan yang sama seperti normalize_nama() di app.py;
+-- baris yang sudah punya kunci (termasuk akhiran #id) tidak diubah
+UPDATE user SET nama_key = LOWER(TRIM(REGEXP_REPLACE(nama, '[[:space:]]+', ' ')))
+WHERE nama_key IS NULL;
+
+-- Nama ganda dari data lama: baris dengan id terkecil mempertahankan kuncinya,
+-- sisanya diberi akhiran id agar constraint UNIQUE bisa dibuat
+UPDATE user u
+JOIN (
+    SELECT nama_key, MIN(id) AS keep_id
+    FROM user
+    GROUP BY nama_key
+    HAVING COUNT(*) > 1
+) d ON u.nama_key = d.nama_key AND u.id <> d.keep_id
+SET u.nama_key = CONCAT(u.nama_key, '#', u.id);
+
+ALTER TABLE user MODIFY nama_key VARCHAR(120) NOT NULL;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'user' AND index_name = 'uq_user_nama_key') = 0,
+    'ALTER TABLE user ADD UNIQUE KEY uq_user_nama_key (nama_key)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,20 @@
+-- 003_daily_rollup.sql
+-- Tabel agregat harian untuk GET /api/trends. Setelah dibuat, isi dari data
+-- lama dengan: flask --app app backfill-rollups
+
+USE heroin_db;
+
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    day DATE NOT NULL,
+    program_studi VARCHAR(100) NOT NULL,
+    angkatan VARCHAR(10) NOT NULL,
+    jenis_kelamin VARCHAR(10) NOT NULL,
+    result_count INT NOT NULL DEFAULT 0,
+    cf_percentage_sum DOUBLE NOT NULL DEFAULT 0,
+    p0_count INT NOT NULL DEFAULT 0, -- CF < 40%
+    p1_count INT NOT NULL DEFAULT 0, -- 40% <= CF < 61%
+    p2_count INT NOT NULL DEFAULT 0, -- 61% <= CF < 81%
+    p3_count INT NOT NULL DEFAULT 0, -- CF >= 81%
+    UNIQUE KEY uq_daily_rollup (day, program_studi, angkatan, jenis_kelamin)
+);
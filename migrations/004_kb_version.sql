@@ -0,0 +1,30 @@
+-- 004_kb_version.sql
+-- Versi knowledge base untuk hot reload di setiap worker. Setiap perubahan
+-- pada hypothesis, symptom, rule, rule_symptom dan question menaikkan
+-- kb_version lewat trigger; worker memeriksa versi ini (satu baris) secara
+-- berkala dan memuat ulang snapshot jika berubah.
+
+USE heroin_db;
+
+CREATE TABLE IF NOT EXISTS kb_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1
+);
+
+INSERT IGNORE INTO kb_version (id, version) VALUES (1, 1);
+
+CREATE TRIGGER trg_hypothesis_ai_kb_version AFTER INSERT ON `hypothesis` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_hypothesis_au_kb_version AFTER UPDATE ON `hypothesis` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_hypothesis_ad_kb_version AFTER DELETE ON `hypothesis` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_symptom_ai_kb_version AFTER INSERT ON `symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_symptom_au_kb_version AFTER UPDATE ON `symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_symptom_ad_kb_version AFTER DELETE ON `symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_ai_kb_version AFTER INSERT ON `rule` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_au_kb_version AFTER UPDATE ON `rule` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_ad_kb_version AFTER DELETE ON `rule` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_symptom_ai_kb_version AFTER INSERT ON `rule_symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_symptom_au_kb_version AFTER UPDATE ON `rule_symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_rule_symptom_ad_kb_version AFTER DELETE ON `rule_symptom` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_question_ai_kb_version AFTER INSERT ON `question` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_question_au_kb_version AFTER UPDATE ON `question` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
+CREATE TRIGGER trg_question_ad_kb_version AFTER DELETE ON `question` FOR EACH ROW UPDATE kb_version SET version = version + 1 WHERE id = 1;
@@ -0,0 +1,12 @@
+-- 005_admins.sql
+-- Akun admin untuk endpoint edit knowledge base (/api/admin/knowledge-base).
+-- Buat akun dengan: flask --app app create-admin
+
+USE heroin_db;
+
+CREATE TABLE IF NOT EXISTS admins (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    password_hash VARCHAR(256) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,13 @@
+-- 006_result_id_block.sql
+-- Blok id result untuk mode write-behind submit kuesioner (WRITE_BEHIND_JOURNAL).
+-- Worker memesan id berurutan dari tabel ini sebelum result ditulis ke database,
+-- sehingga resultId bisa dikembalikan sebelum INSERT dilakukan.
+
+USE heroin_db;
+
+CREATE TABLE IF NOT EXISTS result_id_block (
+    id INT PRIMARY KEY,
+    next_id BIGINT NOT NULL
+);
+
+INSERT IGNORE INTO result_id_block (id, next_id) SELECT 1, COALESCE(MAX(id), 0) + 1 FROM result;
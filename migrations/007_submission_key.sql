@@ -0,0 +1,41 @@
+-- 007_submission_key.sql
+-- Kunci idempotensi submit kuesioner (header Idempotency-Key). Tabel result
+-- dipartisi per bulan sehingga UNIQUE di sana harus menyertakan created_at;
+-- kunci disimpan di tabel terpisah dengan primary key (user_id, kunci) sehingga
+-- kunci hanya berlaku untuk user yang mengirimnya.
+
+USE heroin_db;
+
+CREATE TABLE IF NOT EXISTS submission_key (
+    user_id INT NOT NULL,
+    idempotency_key VARCHAR(64) NOT NULL,
+    result_id INT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, idempotency_key),
+    INDEX idx_submission_key_result (result_id)
+);
+
+-- Tabel dari versi sebelumnya (primary key hanya pada kunci): tambahkan
+-- user_id, isi dari result, lalu jadikan bagian primary key.
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.columns
+     WHERE table_schema = DATABASE() AND table_name = 'submission_key' AND column_name = 'user_id') = 0,
+    'ALTER TABLE submission_key ADD COLUMN user_id INT NOT NULL DEFAULT 0 FIRST',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+UPDATE submission_key k JOIN result r ON r.id = k.result_id SET k.user_id = r.user_id WHERE k.user_id = 0;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.key_column_usage
+     WHERE table_schema = DATABASE() AND table_name = 'submission_key'
+       AND constraint_name = 'PRIMARY' AND column_name = 'user_id') = 0,
+    'ALTER TABLE submission_key ALTER COLUMN user_id DROP DEFAULT, DROP PRIMARY KEY, ADD PRIMARY KEY (user_id, idempotency_key)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
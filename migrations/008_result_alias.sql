@@ -0,0 +1,13 @@
+-- 008_result_alias.sql
+-- Alias id result untuk mode write-behind: dua submit dengan kunci idempotensi
+-- yang sama dari user yang sama bisa sama-sama diberi resultId sebelum di-flush.
+-- Yang kalah tidak disimpan sebagai result; id-nya dipetakan ke result pemenang
+-- agar GET /api/result/<id> tetap menemukan hasilnya.
+
+USE heroin_db;
+
+CREATE TABLE IF NOT EXISTS result_alias (
+    result_id INT PRIMARY KEY,
+    target_id INT NOT NULL,
+    INDEX idx_result_alias_target (target_id)
+);
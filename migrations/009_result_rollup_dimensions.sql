@@ -0,0 +1,21 @@
+-- 009_result_rollup_dimensions.sql
+-- Salinan dimensi agregat harian (program studi, angkatan, jenis kelamin) dan
+-- bucket P0-P3 pada result saat submit. Penghapusan result mengurangi
+-- daily_rollup dengan nilai ini, dan backfill-rollups mengelompokkan
+-- berdasarkan kolom ini, sehingga perubahan profil user atau threshold
+-- hipotesis tidak memindahkan result lama ke grup lain.
+--
+-- Result yang sudah ada tetap NULL; kolomnya diisi dari profil dan threshold
+-- saat ini oleh: flask --app app backfill-rollups
+
+USE heroin_db;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.columns
+     WHERE table_schema = DATABASE() AND table_name = 'result' AND column_name = 'rollup_level') = 0,
+    'ALTER TABLE result ADD COLUMN rollup_program_studi VARCHAR(100) NULL, ADD COLUMN rollup_angkatan VARCHAR(10) NULL, ADD COLUMN rollup_jenis_kelamin VARCHAR(10) NULL, ADD COLUMN rollup_level TINYINT NULL',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,87 @@
+from datetime import datetime
+from sqlalchemy import text
+
+# Tabel yang dipartisi per bulan berdasarkan created_at (lihat
+# migrations/002_partition_result_answer.sql)
+PARTITIONED_TABLES = ('result', 'answer')
+
+def month_start(value):
+    """Tanggal 1 pada bulan dari value (jam 00:00)"""
+    return datetime(value.year, value.month, 1)
+
+def add_months(value, months):
+    """Menggeser tanggal 1 sebuah bulan sebanyak months bulan"""
+    month_index = value.year * 12 + value.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(value):
+    """Nama partisi untuk bulan value, misal p202601"""
+    return f'p{value.year:04d}{value.month:02d}'
+
+def partition_clause(start, end):
+    """
+    Membuat definisi partisi bulanan dari bulan start sampai sebelum bulan
+    end, ditambah partisi pmax untuk data di luar rentang.
+
+    Returns:
+        str: Daftar definisi PARTITION untuk PARTITION BY RANGE
+    """
+    definitions = []
+    month = month_start(start)
+    while month < month_start(end):
+        upper = add_months(month, 1)
+        definitions.append(
+            f"PARTITION {partition_name(month)} VALUES LESS THAN "
+            f"(UNIX_TIMESTAMP('{upper:%Y-%m-%d %H:%M:%S}'))"
+        )
+        month = upper
+    definitions.append('PARTITION pmax VALUES LESS THAN MAXVALUE')
+    return ',\n    '.join(definitions)
+
+def existing_partitions(session, table_name):
+    """Daftar nama partisi yang sudah ada untuk tabel di database aktif"""
+    rows = session.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name "
+        "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+    ), {'table_name': table_name}).scalars().all()
+    return list(rows)
+
+def ensure_future_partitions(session, months_ahead=3, now=None):
+    """
+    Memecah partisi pmax menjadi partisi bulanan sampai months_ahead bulan
+    ke depan. Hanya berlaku untuk MySQL dengan tabel yang sudah dipartisi;
+    database lain (misal SQLite) dilewati.
+
+    Returns:
+        dict: Nama partisi baru per tabel
+    """
+    if session.get_bind().dialect.name != 'mysql':
+        return {}
+    
+    created = {}
+    current = month_start(now or datetime.utcnow())
+    for table_name in PARTITIONED_TABLES:
+        partitions = existing_partitions(session, table_name)
+        if 'pmax' not in partitions:
+            continue
+        
+        monthly = [name for name in partitions if name != 'pmax']
+        if monthly:
+            last = datetime.strptime(monthly[-1][1:], '%Y%m')
+            start = add_months(last, 1)
+        else:
+            start = current
+        end = add_months(current, months_ahead + 1)
+        if start >= end:
+            continue
+        
+        session.execute(text(
+            f"ALTER TABLE `{table_name}` REORGANIZE PARTITION pmax INTO (\n"
+            f"    {partition_clause(start, end)}\n)"
+        ))
+        created[table_name] = [
+            partition_name(add_months(start, i))
+            for i in range((end.year - start.year) * 12 + end.month - start.month)
+        ]
+    return created
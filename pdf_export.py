@@ -0,0 +1,232 @@
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+
+# Ekspor PDF massal: laporan dari report_data.fetch_reports dirender paralel di
+# process pool dari dict biasa (tanpa objek ORM/koneksi database), lalu
+# dialirkan sebagai ZIP begitu tiap PDF selesai.
+
+def report_filename(report):
+    return f"hasil-analisis-{report['resultId']}.pdf"
+
+def render_pdf(report, printed_at=None):
+    """
+    Merender satu laporan PDF dari dict report_data.fetch_reports (ditambah 'trace').
+    Tidak menyentuh database sehingga aman dijalankan di process lain.
+    
+    Returns:
+        bytes: Isi file PDF
+    """
+    user = report['user']
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    elements = []
+    
+    # Judul
+    title_style = styles['Heading1']
+    title_style.alignment = 1  # Center
+    elements.append(Paragraph("LAPORAN HASIL ANALISIS KECANDUAN GAME ONLINE", title_style))
+    elements.append(Paragraph("Sistem Pakar HEROin", styles['Heading2']))
+    elements.append(Paragraph(" ", styles['Normal']))
+    
+    # Informasi Pengguna
+    elements.append(Paragraph("Informasi Pengguna:", styles['Heading3']))
+    
+    user_data = [
+        ["Nama", ": " + user['nama']],
+        ["Usia", ": " + str(user['usia'])],
+        ["Program Studi", ": " + user['programStudi']],
+        ["Angkatan", ": " + user['angkatan']],
+        ["Jenis Kelamin", ": " + user['jenisKelamin']],
+        ["Domisili", ": " + user['domisili']]
+    ]
+    
+    user_table_flowable = Table(user_data, colWidths=[100, 400])
+    user_table_flowable.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ]))
+    elements.append(user_table_flowable)
+    elements.append(Paragraph(" ", styles['Normal']))
+    
+    # Hasil Analisis
+    elements.append(Paragraph("Hasil Analisis:", styles['Heading3']))
+    
+    result_data = [
+        ["Hipotesis", ": " + report['hypothesisDescription']],
+        ["Nilai CF", ": " + str(report['cfValue'])],
+        ["Persentase CF", ": " + f"{report['cfPercentage']:.2f}%"],
+        ["Diagnosis", ": " + report['diagnosis']],
+        ["Rekomendasi", ": " + report['recommendation']]
+    ]
+    
+    result_table_flowable = Table(result_data, colWidths=[100, 400])
+    result_table_flowable.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ]))
+    elements.append(result_table_flowable)
+    elements.append(Paragraph(" ", styles['Normal']))
+    
+    # Detail Gejala
+    elements.append(Paragraph("Detail Gejala yang Teridentifikasi:", styles['Heading3']))
+    
+    # Header tabel
+    gejala_data = [["No", "Kode", "Gejala", "CF Expert", "CF User", "CF Kombinasi"]]
+    
+    # Isi tabel
+    for i, detail in enumerate(report['symptomDetails']):
+        gejala_data.append([
+            str(i+1),
+            detail['symptomCode'],
+            detail['symptomText'],
+            str(detail['cfExpert']),
+            str(detail['cfUser']),
+            f"{detail['cfCombined']:.3f}"
+        ])
+    
+    gejala_table = Table(gejala_data, colWidths=[30, 40, 280, 60, 60, 80])
+    gejala_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.purple),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    elements.append(gejala_table)
+    elements.append(Paragraph(" ", styles['Normal']))
+    
+    # Penelusuran inferensi: langkah kombinasi CF dan evaluasi rule
+    trace = report['trace']
+    elements.append(Paragraph("Penelusuran Inferensi:", styles['Heading3']))
+    
+    langkah_data = [["Langkah", "Kode", "CF Gejala", "CF Sebelum", "CF Sesudah", "Formula"]]
+    for step in trace['steps']:
+        langkah_data.append([
+            str(step['step']),
+            step['symptomCode'],
+            f"{step['cfSymptom']:.3f}",
+            f"{step['cfBefore']:.3f}" if step['cfBefore'] is not None else '-',
+            f"{step['cfAfter']:.3f}",
+            step['formula']
+        ])
+    
+    rule_data = [["Rule", "Status", "Gejala Kurang"]]
+    for rule in trace['rules']:
+        rule_data.append([
+            rule['ruleName'],
+            'Terpenuhi' if rule['matched'] else 'Tidak terpenuhi',
+            ', '.join(rule['missingSymptoms']) or '-'
+        ])
+    
+    trace_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.purple),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+    langkah_table = Table(langkah_data, colWidths=[50, 40, 60, 65, 65, 170])
+    langkah_table.setStyle(trace_style)
+    elements.append(langkah_table)
+    elements.append(Paragraph(" ", styles['Normal']))
+    
+    rule_table = Table(rule_data, colWidths=[120, 100, 230])
+    rule_table.setStyle(trace_style)
+    elements.append(rule_table)
+    
+    if trace['missingSymptoms']:
+        elements.append(Paragraph(f"Gejala tidak dijawab: {', '.join(trace['missingSymptoms'])}", styles['Normal']))
+    
+    # Tanggal dan waktu cetak
+    printed_at = printed_at or datetime.now().strftime('%d-%m-%Y %H:%M:%S')
+    elements.append(Paragraph(" ", styles['Normal']))
+    elements.append(Paragraph(f"Dicetak pada: {printed_at}", styles['Normal']))
+    
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
+
+def render_all(reports, workers=None, printed_at=None):
+    """
+    Merender laporan secara paralel dan menghasilkan (report, pdf) sesuai
+    urutan selesai. Jumlah tugas yang sedang berjalan dibatasi 2 × workers
+    sehingga memori tetap kecil untuk kohort besar.
+    
+    Args:
+        reports (list): Hasil report_data.fetch_reports (dengan 'trace')
+        workers (int): Jumlah process; None = jumlah CPU, 1 = tanpa pool
+        printed_at (str): Waktu cetak yang sama untuk semua laporan
+    """
+    workers = workers or os.cpu_count() or 1
+    printed_at = printed_at or datetime.now().strftime('%d-%m-%Y %H:%M:%S')
+    if workers == 1 or len(reports) < 2:
+        for report in reports:
+            yield report, render_pdf(report, printed_at)
+        return
+    
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(reports)))
+    try:
+        queue = iter(reports)
+        pending = {}
+        
+        def submit():
+            report = next(queue, None)
+            if report is not None:
+                pending[executor.submit(render_pdf, report, printed_at)] = report
+        
+        for _ in range(workers * 2):
+            submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                report = pending.pop(future)
+                submit()
+                yield report, future.result()
+    finally:
+        # Klien memutus unduhan: tugas yang belum mulai dibatalkan
+        executor.shutdown(wait=False, cancel_futures=True)
+
+class StreamSink(io.RawIOBase):
+    """Tujuan tulis ZipFile yang tidak bisa di-seek; isinya diambil per potongan"""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream_zip(reports, workers=None, printed_at=None):
+    """
+    Generator isi file ZIP berisi satu PDF per laporan; potongan dikirim
+    segera setelah tiap PDF selesai dirender.
+    """
+    sink = StreamSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for report, pdf in render_all(reports, workers, printed_at):
+            archive.writestr(report_filename(report), pdf)
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
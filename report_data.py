@@ -0,0 +1,216 @@
+from sqlalchemy import table, column, select, DateTime
+from serialization import RowMapper, isoformat
+
+# Data laporan per result (Excel/PDF) tanpa hidrasi ORM: result + user +
+# hypothesis dalam satu query join, answer + symptom dalam satu query lagi,
+# hasilnya dict biasa yang bisa dikirim ke process lain.
+
+result_table = table('result', column('id'), column('user_id'), column('hypothesis_id'), column('cf_value'),
+                     column('cf_percentage'), column('diagnosis'), column('recommendation'),
+                     column('created_at', DateTime))
+user_table = table('user', column('id'), column('nama'), column('usia'), column('program_studi'),
+                   column('angkatan'), column('jenis_kelamin'), column('domisili'), column('created_at', DateTime))
+hypothesis_table = table('hypothesis', column('id'), column('code'), column('name'), column('description'),
+                         column('cf_threshold_min'), column('cf_threshold_max'))
+answer_table = table('answer', column('id'), column('result_id'), column('symptom_id'), column('cf_user'),
+                     column('cf_combined'), column('created_at', DateTime))
+symptom_table = table('symptom', column('id'), column('code'), column('description'), column('cf_expert'))
+
+# Bentuk output GET /api/result (sama dengan User.to_dict dan Hypothesis.to_dict)
+USER_INFO = RowMapper([
+    ('id', user_table.c.id),
+    ('nama', user_table.c.nama),
+    ('usia', user_table.c.usia),
+    ('angkatan', user_table.c.angkatan),
+    ('programStudi', user_table.c.program_studi),
+    ('domisili', user_table.c.domisili),
+    ('jenisKelamin', user_table.c.jenis_kelamin),
+    ('createdAt', user_table.c.created_at, isoformat)
+])
+HYPOTHESIS = RowMapper([
+    ('id', hypothesis_table.c.id),
+    ('code', hypothesis_table.c.code),
+    ('name', hypothesis_table.c.name),
+    ('description', hypothesis_table.c.description),
+    ('cfThresholdMin', hypothesis_table.c.cf_threshold_min),
+    ('cfThresholdMax', hypothesis_table.c.cf_threshold_max)
+])
+RESULT_SUMMARY = RowMapper([
+    ('id', result_table.c.id),
+    ('cfValue', result_table.c.cf_value),
+    ('cfPercentage', result_table.c.cf_percentage),
+    ('diagnosis', result_table.c.diagnosis),
+    ('recommendation', result_table.c.recommendation),
+    ('createdAt', result_table.c.created_at, isoformat)
+])
+IDENTIFIED_SYMPTOM = RowMapper([
+    ('symptomCode', symptom_table.c.code),
+    ('symptomText', symptom_table.c.description),
+    ('cfExpert', symptom_table.c.cf_expert),
+    ('cfUser', answer_table.c.cf_user),
+    ('cfCombined', answer_table.c.cf_combined)
+])
+
+def fetch_reports(connection, result_ids=None, start=None, end=None, answers=True):
+    """
+    Data laporan untuk result tertentu atau rentang created_at, urut id result.
+    
+    Args:
+        answers (bool): False untuk ringkasan saja (tanpa query answer)
+    
+    Returns:
+        list: dict per result dengan user, hipotesis dan symptomDetails (urut id answer)
+    """
+    filters = []
+    # answer.created_at disalin dari result: rentang yang sama membatasi
+    # partisi answer yang dibaca (partition pruning)
+    answer_filters = []
+    if result_ids is not None:
+        filters.append(result_table.c.id.in_(result_ids))
+    if start:
+        filters.append(result_table.c.created_at >= start)
+        answer_filters.append(answer_table.c.created_at >= start)
+    if end:
+        filters.append(result_table.c.created_at < end)
+        answer_filters.append(answer_table.c.created_at < end)
+    
+    result_rows = connection.execute(
+        select(
+            result_table.c.id, result_table.c.hypothesis_id, result_table.c.cf_value,
+            result_table.c.cf_percentage, result_table.c.diagnosis, result_table.c.recommendation,
+            result_table.c.created_at,
+            user_table.c.nama, user_table.c.usia, user_table.c.program_studi, user_table.c.angkatan,
+            user_table.c.jenis_kelamin, user_table.c.domisili,
+            hypothesis_table.c.description.label('hypothesis_description')
+        )
+        .select_from(result_table)
+        .join(user_table, user_table.c.id == result_table.c.user_id)
+        .join(hypothesis_table, hypothesis_table.c.id == result_table.c.hypothesis_id)
+        .where(*filters)
+        .order_by(result_table.c.id)
+    ).all()
+    
+    reports = {}
+    for row in result_rows:
+        reports[row.id] = {
+            'resultId': row.id,
+            'hypothesisId': row.hypothesis_id,
+            'hypothesisDescription': row.hypothesis_description,
+            'cfValue': row.cf_value,
+            'cfPercentage': row.cf_percentage,
+            'diagnosis': row.diagnosis,
+            'recommendation': row.recommendation,
+            'createdAt': row.created_at,
+            'user': {
+                'nama': row.nama,
+                'usia': row.usia,
+                'programStudi': row.program_studi,
+                'angkatan': row.angkatan,
+                'jenisKelamin': row.jenis_kelamin,
+                'domisili': row.domisili
+            },
+            'symptomDetails': []
+        }
+    if not reports or not answers:
+        return list(reports.values())
+    
+    # Filter yang sama lewat join ke result: satu query untuk semua jawaban
+    answer_rows = connection.execute(
+        select(
+            answer_table.c.result_id, answer_table.c.symptom_id, answer_table.c.cf_user,
+            answer_table.c.cf_combined, symptom_table.c.code, symptom_table.c.description,
+            symptom_table.c.cf_expert
+        )
+        .select_from(answer_table)
+        .join(result_table, result_table.c.id == answer_table.c.result_id)
+        .join(symptom_table, symptom_table.c.id == answer_table.c.symptom_id)
+        .where(*filters, *answer_filters)
+        .order_by(answer_table.c.id)
+    )
+    for row in answer_rows:
+        report = reports.get(row.result_id)
+        if report is not None:
+            report['symptomDetails'].append({
+                'symptomId': row.symptom_id,
+                'symptomCode': row.code,
+                'symptomText': row.description,
+                'cfExpert': row.cf_expert,
+                'cfUser': row.cf_user,
+                'cfCombined': row.cf_combined
+            })
+    
+    return list(reports.values())
+
+def fetch_user_info(connection, user_id):
+    """User dalam format USER_INFO, atau None"""
+    row = connection.execute(select(*USER_INFO.columns).where(user_table.c.id == user_id)).first()
+    return USER_INFO(row) if row is not None else None
+
+def fetch_result_detail(connection, result_id):
+    """
+    Data GET /api/result dalam dua query (result + user + hypothesis, lalu
+    answer + symptom), langsung dari baris hasil query.
+    
+    Returns:
+        tuple: (dict result, [(symptom_id, cf_user, cf_combined), ...] urut id
+            answer untuk jejak inferensi), atau None jika result tidak ada
+    """
+    row = connection.execute(
+        select(result_table.c.hypothesis_id, *RESULT_SUMMARY.columns, *USER_INFO.columns, *HYPOTHESIS.columns)
+        .select_from(result_table)
+        .join(user_table, user_table.c.id == result_table.c.user_id)
+        .join(hypothesis_table, hypothesis_table.c.id == result_table.c.hypothesis_id)
+        .where(result_table.c.id == result_id)
+    ).first()
+    if row is None:
+        return None
+    
+    offset = 1 + RESULT_SUMMARY.width
+    summary = RESULT_SUMMARY(row, 1)
+    answer_rows = connection.execute(
+        select(*IDENTIFIED_SYMPTOM.columns, answer_table.c.symptom_id)
+        .select_from(answer_table)
+        .join(symptom_table, symptom_table.c.id == answer_table.c.symptom_id)
+        .where(answer_table.c.result_id == result_id)
+        .order_by(answer_table.c.id)
+    ).all()
+    
+    identified_symptoms = []
+    for answer in answer_rows:
+        symptom = IDENTIFIED_SYMPTOM(answer)
+        symptom['cfValue'] = symptom['cfCombined']  # Untuk kompatibilitas dengan frontend
+        identified_symptoms.append(symptom)
+    
+    result_data = {
+        'id': summary['id'],
+        'userInfo': USER_INFO(row, offset),
+        'hypothesis': HYPOTHESIS(row, offset + USER_INFO.width),
+        'cfValue': summary['cfValue'],
+        'cfPercentage': summary['cfPercentage'],
+        'diagnosis': summary['diagnosis'],
+        'recommendation': summary['recommendation'],
+        'identifiedSymptoms': identified_symptoms,
+        'createdAt': summary['createdAt']
+    }
+    answers = [(answer.symptom_id, answer.cf_user, answer.cf_combined) for answer in answer_rows]
+    return result_data, answers
+
+def latest_results(connection, user_ids):
+    """
+    Result terbaru (created_at, lalu id terbesar) per user dalam satu query.
+    
+    Returns:
+        dict: user_id -> {'cfValue', 'cfPercentage', 'resultId'}
+    """
+    if not user_ids:
+        return {}
+    rows = connection.execute(
+        select(result_table.c.user_id, result_table.c.cf_value, result_table.c.cf_percentage, result_table.c.id)
+        .where(result_table.c.user_id.in_(user_ids))
+        .order_by(result_table.c.user_id, result_table.c.created_at.desc(), result_table.c.id.desc())
+    )
+    latest = {}
+    for user_id, cf_value, cf_percentage, result_id in rows:
+        if user_id not in latest:
+            latest[user_id] = {'cfValue': cf_value, 'cfPercentage': cf_percentage, 'resultId': result_id}
+    return latest
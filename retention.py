@@ -0,0 +1,142 @@
+import time
+from datetime import datetime
+from sqlalchemy import table, column, select, delete, exists, and_, DateTime
+import idempotency
+import rollups
+
+# Tabel ringan (tanpa ORM) sesuai skema migrations.sql. Baris answer terhapus
+# lewat ON DELETE CASCADE, atau secara eksplisit jika tabel sudah dipartisi
+# (tabel terpartisi MySQL tidak mendukung foreign key).
+result_table = table('result', column('id'), column('user_id'), column('created_at', DateTime))
+answer_table = table('answer', column('id'), column('result_id'))
+user_table = table('user', column('id'), column('created_at', DateTime))
+
+def delete_results(session, result_ids):
+    """
+    Menghapus banyak result sekaligus dengan DELETE berbasis himpunan, lalu
+    menghapus user yang tidak lagi memiliki result. Agregat harian dikurangi
+    dalam transaksi yang sama (rollups.subtract_results), sehingga tren dan
+    backfill tetap sepakat setelah penghapusan maupun purge. Tidak melakukan
+    commit, sehingga pemanggil bisa menjalankannya dalam satu transaksi.
+    
+    Args:
+        session: SQLAlchemy session
+        result_ids (list): Daftar id result yang akan dihapus
+    
+    Returns:
+        dict: Jumlah result dan user yang terhapus
+    """
+    result_ids = list({int(result_id) for result_id in result_ids})
+    if not result_ids:
+        return {'results': 0, 'users': 0}
+    
+    user_ids = session.execute(
+        select(result_table.c.user_id).distinct().where(result_table.c.id.in_(result_ids))
+    ).scalars().all()
+    
+    rollups.subtract_results(session, result_ids)
+    session.execute(delete(answer_table).where(answer_table.c.result_id.in_(result_ids)))
+    idempotency.delete_keys(session, result_ids)
+    deleted_results = session.execute(
+        delete(result_table).where(result_table.c.id.in_(result_ids))
+    ).rowcount
+    
+    deleted_users = 0
+    if user_ids:
+        deleted_users = session.execute(
+            delete(user_table).where(and_(
+                user_table.c.id.in_(user_ids),
+                ~exists().where(result_table.c.user_id == user_table.c.id)
+            ))
+        ).rowcount
+    
+    return {'results': deleted_results, 'users': deleted_users}
+
+def in_peak_hours(peak_hours, now=None):
+    """
+    Mengecek apakah waktu sekarang berada dalam jam sibuk.
+    
+    Args:
+        peak_hours (tuple): (jam_mulai, jam_selesai), misal (7, 17). Rentang
+                            yang melewati tengah malam seperti (22, 2) didukung.
+    """
+    if not peak_hours:
+        return False
+    
+    start, end = peak_hours
+    hour = (now or datetime.now()).hour
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+def purge_results(session, cutoff, batch_size=1000, pause=0.5, peak_hours=None, log=print):
+    """
+    Menghapus result yang lebih lama dari cutoff beserta user yatim secara
+    bertahap. Setiap batch adalah transaksi pendek tersendiri dan job berhenti
+    sejenak di antara batch agar tabel tidak terkunci lama. Jika memasuki jam
+    sibuk, job berhenti dan bisa dilanjutkan pada jadwal berikutnya.
+    
+    Args:
+        session: SQLAlchemy session
+        cutoff (datetime): Result dengan created_at < cutoff akan dihapus
+        batch_size (int): Jumlah baris per DELETE
+        pause (float): Jeda (detik) antar batch
+        peak_hours (tuple): Jam sibuk (jam_mulai, jam_selesai) atau None
+    
+    Returns:
+        dict: Ringkasan jumlah baris yang dihapus
+    """
+    summary = {'results': 0, 'users': 0, 'batches': 0, 'stoppedForPeakHours': False}
+    
+    def throttle():
+        summary['batches'] += 1
+        if pause:
+            time.sleep(pause)
+    
+    # Tahap 1: result lama (answer ikut terhapus lewat cascade)
+    while True:
+        if in_peak_hours(peak_hours):
+            summary['stoppedForPeakHours'] = True
+            return summary
+        
+        result_ids = session.execute(
+            select(result_table.c.id)
+            .where(result_table.c.created_at < cutoff)
+            .order_by(result_table.c.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not result_ids:
+            break
+        
+        deleted = delete_results(session, result_ids)
+        session.commit()
+        summary['results'] += deleted['results']
+        summary['users'] += deleted['users']
+        log(f"Batch {summary['batches'] + 1}: {deleted['results']} result, {deleted['users']} user dihapus")
+        throttle()
+    
+    # Tahap 2: user lama yang tidak pernah/tidak lagi memiliki result
+    no_result = ~exists().where(result_table.c.user_id == user_table.c.id)
+    while True:
+        if in_peak_hours(peak_hours):
+            summary['stoppedForPeakHours'] = True
+            return summary
+        
+        user_ids = session.execute(
+            select(user_table.c.id)
+            .where(and_(user_table.c.created_at < cutoff, no_result))
+            .order_by(user_table.c.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not user_ids:
+            break
+        
+        deleted_users = session.execute(
+            delete(user_table).where(and_(user_table.c.id.in_(user_ids), no_result))
+        ).rowcount
+        session.commit()
+        summary['users'] += deleted_users
+        log(f"Batch {summary['batches'] + 1}: {deleted_users} user yatim dihapus")
+        throttle()
+    
+    return summary
@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from sqlalchemy import table, column, select, delete, insert, update, func, case, and_, Date, DateTime
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+import diagnosis_index
+
+# Agregat harian per program studi/angkatan/jenis kelamin (tabel daily_rollup)
+DIMENSIONS = ('program_studi', 'angkatan', 'jenis_kelamin')
+COUNTERS = ('result_count', 'cf_percentage_sum', 'p0_count', 'p1_count', 'p2_count', 'p3_count')
+
+# Dimensi dan bucket disalin ke result saat submit (kolom rollup_*), sehingga
+# penghapusan dan backfill memakai profil user dan threshold saat result
+# dicatat, bukan profil/threshold terbaru.
+SNAPSHOT_COLUMNS = tuple(f'rollup_{name}' for name in DIMENSIONS) + ('rollup_level',)
+
+rollup_table = table('daily_rollup', column('day', Date), *(column(name) for name in DIMENSIONS + COUNTERS))
+result_table = table('result', column('id'), column('user_id'), column('cf_percentage'), column('created_at', DateTime),
+                     *(column(name) for name in SNAPSHOT_COLUMNS))
+user_table = table('user', column('id'), *(column(name) for name in DIMENSIONS))
+
+# Kunci parameter groupBy pada endpoint tren -> kolom dimensi
+GROUP_BY_COLUMNS = {
+    'programStudi': 'program_studi',
+    'angkatan': 'angkatan',
+    'jenisKelamin': 'jenis_kelamin'
+}
+
+# Kolom p0_count..p3_count menampung P0 sampai P3
+BUCKETS = 4
+
+def addiction_bucket(cf_percentage):
+    """Kode tingkat kecanduan P0-P3 sesuai threshold hipotesis (0-3)"""
+    return min(diagnosis_index.current().rank(cf_percentage), BUCKETS - 1)
+
+def bucket_case(cf_percentage, bucket):
+    """Ekspresi SQL bernilai 1 jika cf_percentage masuk bucket P0-P3"""
+    boundaries = diagnosis_index.current().boundaries[:BUCKETS - 1]
+    bounds = ([None] + boundaries)[bucket], (boundaries + [None])[bucket]
+    conditions = []
+    if bounds[0] is not None:
+        conditions.append(cf_percentage >= bounds[0])
+    if bounds[1] is not None:
+        conditions.append(cf_percentage < bounds[1])
+    return case((and_(*conditions), 1), else_=0)
+
+def snapshot(program_studi, angkatan, jenis_kelamin, cf_percentage):
+    """Nilai kolom rollup_* untuk result baru"""
+    return dict(zip(SNAPSHOT_COLUMNS, (program_studi, angkatan, jenis_kelamin, addiction_bucket(cf_percentage))))
+
+def record_result(session, day, program_studi, angkatan, jenis_kelamin, cf_percentage, sign=1, level=None):
+    """
+    Menambah (atau mengurangi jika sign=-1) satu result ke agregat hariannya
+    lewat upsert atomik. Tidak melakukan commit, sehingga dijalankan dalam
+    transaksi yang sama dengan penyimpanan result.
+    
+    Args:
+        level (int): Bucket P0-P3 yang tersimpan di result (rollup_level);
+            None = dihitung dari threshold saat ini
+    """
+    values = {
+        'day': day,
+        'program_studi': program_studi,
+        'angkatan': angkatan,
+        'jenis_kelamin': jenis_kelamin,
+        'result_count': sign,
+        'cf_percentage_sum': sign * cf_percentage,
+        'p0_count': 0,
+        'p1_count': 0,
+        'p2_count': 0,
+        'p3_count': 0
+    }
+    values[f'p{addiction_bucket(cf_percentage) if level is None else level}_count'] = sign
+    dialect = session.get_bind().dialect.name
+    
+    if dialect == 'mysql':
+        stmt = mysql.insert(rollup_table).values(**values)
+        stmt = stmt.on_duplicate_key_update(**{
+            name: rollup_table.c[name] + stmt.inserted[name] for name in COUNTERS
+        })
+    else:
+        insert_for_dialect = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert_for_dialect(rollup_table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['day', *DIMENSIONS],
+            set_={name: rollup_table.c[name] + stmt.excluded[name] for name in COUNTERS}
+        )
+    session.execute(stmt)
+
+def subtract_results(session, result_ids):
+    """
+    Mengurangi result yang akan dihapus dari agregat harian, memakai dimensi
+    dan bucket yang tersimpan di result (rollup_*). Dijalankan sebelum
+    penghapusan dalam transaksi yang sama; result lain pada hari itu tidak
+    disentuh. Result lama tanpa salinan dilengkapi dulu (fill_snapshots).
+    """
+    result_ids = [int(result_id) for result_id in result_ids]
+    if not result_ids:
+        return
+    fill_snapshots(session, result_table.c.id.in_(result_ids))
+    rows = session.execute(
+        select(result_table.c.created_at, result_table.c.cf_percentage,
+               *(result_table.c[name] for name in SNAPSHOT_COLUMNS))
+        .where(result_table.c.id.in_(result_ids))
+    )
+    for created_at, cf_percentage, program_studi, angkatan, jenis_kelamin, level in rows:
+        record_result(
+            session, created_at.date(), program_studi, angkatan, jenis_kelamin, cf_percentage,
+            sign=-1, level=level
+        )
+
+def fill_snapshots(session, *filters):
+    """
+    Mengisi kolom rollup_* yang masih NULL (result dari sebelum migrasi 009)
+    dari profil user dan threshold saat ini.
+    """
+    pct = result_table.c.cf_percentage
+    level = case(*((bucket_case(pct, bucket) == 1, bucket) for bucket in range(BUCKETS)), else_=0)
+    values = {
+        f'rollup_{name}': select(user_table.c[name]).where(user_table.c.id == result_table.c.user_id)
+        .scalar_subquery()
+        for name in DIMENSIONS
+    }
+    values['rollup_level'] = level
+    session.execute(
+        update(result_table).where(result_table.c.rollup_level.is_(None), *filters).values(**values)
+    )
+
+def backfill(session, start=None, end=None):
+    """
+    Menghitung ulang agregat harian dari tabel result untuk rentang
+    [start, end) dengan satu DELETE dan satu INSERT ... SELECT. Tanpa
+    rentang, seluruh data dihitung ulang. Dimensi dan bucket diambil dari
+    kolom rollup_* result. Tidak melakukan commit.
+    
+    Returns:
+        int: Jumlah baris agregat yang ditulis
+    """
+    day = func.date(result_table.c.created_at)
+    pct = result_table.c.cf_percentage
+    
+    rollup_filters = []
+    result_filters = []
+    if start:
+        rollup_filters.append(rollup_table.c.day >= start.date())
+        result_filters.append(result_table.c.created_at >= start)
+    if end:
+        rollup_filters.append(rollup_table.c.day < end.date())
+        result_filters.append(result_table.c.created_at < end)
+    
+    fill_snapshots(session, *result_filters)
+    session.execute(delete(rollup_table).where(*rollup_filters))
+    
+    dimensions = [result_table.c[f'rollup_{name}'] for name in DIMENSIONS]
+    level = result_table.c.rollup_level
+    source = (
+        select(
+            day,
+            *dimensions,
+            func.count(result_table.c.id),
+            func.sum(pct),
+            *(func.sum(case((level == bucket, 1), else_=0)) for bucket in range(BUCKETS))
+        )
+        .where(*result_filters)
+        .group_by(day, *dimensions)
+    )
+    return session.execute(
+        insert(rollup_table).from_select(['day', *DIMENSIONS, *COUNTERS], source)
+    ).rowcount
+
+def period_start(day, granularity):
+    """Awal periode: hari itu sendiri, atau Senin untuk granularity 'week'"""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    elif isinstance(day, datetime):
+        day = day.date()
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+def trends(session, granularity='day', group_by='programStudi', start=None, end=None):
+    """
+    Tren tingkat kecanduan per hari/minggu per grup, hanya membaca tabel
+    daily_rollup.
+    
+    Returns:
+        list: Deret per (periode, grup) terurut berdasarkan periode
+    """
+    group_column = rollup_table.c[GROUP_BY_COLUMNS[group_by]]
+    filters = []
+    if start:
+        filters.append(rollup_table.c.day >= start.date())
+    if end:
+        filters.append(rollup_table.c.day < end.date())
+    
+    rows = session.execute(
+        select(rollup_table.c.day, group_column, *(func.sum(rollup_table.c[name]) for name in COUNTERS))
+        .where(*filters)
+        .group_by(rollup_table.c.day, group_column)
+        .order_by(rollup_table.c.day)
+    ).all()
+    
+    # Hari -> minggu digabung di sini; jumlah baris sudah kecil (hari x grup)
+    series = OrderedDict()
+    for row in rows:
+        key = (period_start(row[0], granularity), row[1])
+        totals = series.setdefault(key, [0] * len(COUNTERS))
+        for i, value in enumerate(row[2:]):
+            totals[i] += value or 0
+    
+    data = []
+    for (period, group), totals in series.items():
+        count, cf_sum, p0, p1, p2, p3 = totals
+        if count <= 0:
+            continue
+        data.append({
+            'period': period.isoformat(),
+            'group': group,
+            'count': int(count),
+            'averageCfPercentage': float(cf_sum) / count,
+            'levels': {'P0': int(p0), 'P1': int(p1), 'P2': int(p2), 'P3': int(p3)}
+        })
+    return data
@@ -0,0 +1,69 @@
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serialisasi respons JSON: encoder orjson (jika terpasang) untuk jsonify, dan
+# RowMapper yang memetakan baris hasil query langsung ke dict output memakai
+# pemetaan kolom -> kunci yang dihitung sekali, tanpa hidrasi objek ORM.
+
+if orjson is not None:
+    # datetime tetap lewat default Flask (format RFC 822) agar keluaran sama;
+    # numpy (analitik) dan kunci non-string diserialisasi seperti json stdlib
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider Flask berbasis orjson; tanpa orjson perilakunya sama dengan
+    DefaultJSONProvider. Kunci tidak diurutkan (urutan dict dipertahankan)
+    dan karakter non-ASCII ditulis sebagai UTF-8.
+    """
+    
+    sort_keys = False
+    ensure_ascii = False
+    
+    def dumps(self, obj, **kwargs):
+        # orjson selalu ringkas; indent dan opsi json lain memakai stdlib
+        if orjson is None or set(kwargs) - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class RowMapper:
+    """
+    Pemetaan kolom query -> kunci output untuk satu bentuk respons.
+    
+    Args:
+        fields (list): (kunci output, kolom SQLAlchemy) atau
+            (kunci output, kolom, konversi); konversi tidak dipanggil untuk None
+    """
+    
+    def __init__(self, fields):
+        self.keys = tuple(field[0] for field in fields)
+        self.columns = [field[1] for field in fields]
+        self.converters = [(field[0], field[2]) for field in fields if len(field) > 2]
+        self.width = len(fields)
+    
+    def __call__(self, row, offset=0):
+        """dict output dari row[offset:offset + width]"""
+        data = dict(zip(self.keys, row[offset:offset + self.width] if offset else row))
+        for key, convert in self.converters:
+            value = data[key]
+            if value is not None:
+                data[key] = convert(value)
+        return data
+    
+    def all(self, rows):
+        return [self(row) for row in rows]
@@ -0,0 +1,219 @@
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+# Jawaban disimpan sebagai nilai cf_user x 100 (int8), -1 berarti belum dijawab
+UNANSWERED = -1
+SCALE = 100
+
+class QuestionnaireSession:
+    """Satu sesi kuesioner; __slots__ agar tiap record tetap kecil"""
+    __slots__ = ('session_id', 'user_id', 'hypothesis_id', 'answers', 'expires_at')
+    
+    def __init__(self, session_id, user_id, hypothesis_id, answers, expires_at):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.hypothesis_id = hypothesis_id
+        self.answers = answers
+        self.expires_at = expires_at
+
+class SessionStore:
+    """
+    Penyimpanan sesi kuesioner dengan TTL.
+    
+    Jawaban disimpan sebagai array int8 yang diindeks posisi gejala (bukan
+    dict), sehingga satu sesi hanya beberapa ratus byte dan puluhan ribu
+    responden aktif muat dalam beberapa MB. Sesi yang disentuh dipindah ke
+    akhir OrderedDict, sehingga urutan dict sama dengan urutan kedaluwarsa
+    dan eviksi cukup membuang dari depan.
+    
+    Tanpa shared_path sesi hanya ada di memori proses yang membuatnya, dan
+    sesi tertua dibuang jika melewati max_sessions. Mode ini hanya benar
+    untuk satu worker atau load balancer dengan sticky routing.
+    
+    Dengan shared_path, file SQLite lokal menjadi sumber kebenaran bersama
+    untuk semua worker di satu mesin. Setiap perubahan langsung ditulis
+    (write-through), dan setiap get membaca ulang dari file. Jawaban disimpan
+    per symptom_id, bukan per posisi, karena urutan indeks gejala antar worker
+    bisa berbeda setelah hot reload. Sesi kedaluwarsa di file dibersihkan
+    paling sering sekali per purge_interval detik saat store diakses.
+    """
+    
+    def __init__(self, symptom_ids, ttl=3600, max_sessions=50000, shared_path=None, purge_interval=60.0,
+                 clock=time.monotonic):
+        self.symptom_index = {symptom_id: i for i, symptom_id in enumerate(symptom_ids)}
+        self.symptom_ids = list(symptom_ids)
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.purge_interval = purge_interval
+        self.clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared = None
+        self._purged_at = None
+        if shared_path:
+            self._shared = sqlite3.connect(shared_path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            self._shared.execute('PRAGMA journal_mode=WAL')
+            self._shared.execute(
+                'CREATE TABLE IF NOT EXISTS shared_session ('
+                'session_id TEXT PRIMARY KEY, user_id INTEGER, hypothesis_id INTEGER, expires_at REAL)'
+            )
+            self._shared.execute('CREATE INDEX IF NOT EXISTS idx_shared_session_expires ON shared_session (expires_at)')
+            self._shared.execute(
+                'CREATE TABLE IF NOT EXISTS shared_session_answer ('
+                'session_id TEXT, symptom_id INTEGER, value INTEGER, '
+                'PRIMARY KEY (session_id, symptom_id)) WITHOUT ROWID'
+            )
+    
+    def __len__(self):
+        if self._shared is not None:
+            with self._lock:
+                return self._shared.execute('SELECT COUNT(*) FROM shared_session').fetchone()[0]
+        return len(self._sessions)
+    
+    def create(self, session_id, user_id, hypothesis_id):
+        """Membuat sesi kosong baru"""
+        session = QuestionnaireSession(
+            session_id, user_id, hypothesis_id,
+            array('b', [UNANSWERED]) * len(self.symptom_ids),
+            self.clock() + self.ttl
+        )
+        with self._lock:
+            if self._shared is not None:
+                self._shared.execute(
+                    'INSERT OR REPLACE INTO shared_session VALUES (?, ?, ?, ?)',
+                    (session_id, user_id, hypothesis_id, time.time() + self.ttl)
+                )
+                self._maybe_purge()
+            else:
+                self._sessions[session_id] = session
+                self._evict()
+        return session
+    
+    def get(self, session_id):
+        """Mengambil sesi (memperpanjang TTL), atau None jika tidak ada/kedaluwarsa"""
+        with self._lock:
+            if self._shared is not None:
+                self._maybe_purge()
+                return self._load_shared(session_id)
+            
+            now = self.clock()
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.expires_at <= now:
+                del self._sessions[session_id]
+                return None
+            
+            session.expires_at = now + self.ttl
+            self._sessions.move_to_end(session_id)
+            self._evict()
+            return session
+    
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self._shared is not None:
+                self._shared.execute('BEGIN IMMEDIATE')
+                self._shared.execute('DELETE FROM shared_session_answer WHERE session_id = ?', (session_id,))
+                self._shared.execute('DELETE FROM shared_session WHERE session_id = ?', (session_id,))
+                self._shared.execute('COMMIT')
+    
+    def add_symptoms(self, symptom_ids):
+        """
+        Mendaftarkan gejala baru setelah knowledge base dimuat ulang. Indeks
+        gejala lama tidak berubah sehingga vektor sesi yang ada tetap valid.
+        """
+        with self._lock:
+            self._add_symptoms(symptom_ids)
+    
+    def _add_symptoms(self, symptom_ids):
+        for symptom_id in symptom_ids:
+            if symptom_id not in self.symptom_index:
+                self.symptom_index[symptom_id] = len(self.symptom_ids)
+                self.symptom_ids.append(symptom_id)
+    
+    def set_answer(self, session, symptom_id, cf_user):
+        """
+        Menyimpan jawaban ke vektor sesi (dan ke file bersama jika ada).
+        
+        Raises:
+            KeyError: Jika symptom_id tidak dikenal
+        """
+        i = self.symptom_index[symptom_id]
+        if i >= len(session.answers):
+            # Sesi dibuat sebelum gejala ini ditambahkan
+            session.answers.extend([UNANSWERED] * (len(self.symptom_ids) - len(session.answers)))
+        value = int(round(cf_user * SCALE))
+        session.answers[i] = value
+        if self._shared is not None:
+            # Satu baris per gejala: jawaban bersamaan dari worker lain tidak saling menimpa
+            with self._lock:
+                self._shared.execute(
+                    'INSERT OR REPLACE INTO shared_session_answer VALUES (?, ?, ?)',
+                    (session.session_id, symptom_id, value)
+                )
+    
+    def answers(self, session):
+        """Jawaban sesi sebagai dict symptom_id -> cf_user (urut indeks gejala)"""
+        return {
+            self.symptom_ids[i]: value / SCALE
+            for i, value in enumerate(session.answers)
+            if value != UNANSWERED
+        }
+    
+    def evict_expired(self):
+        """Membuang sesi kedaluwarsa dari memori dan file bersama"""
+        with self._lock:
+            self._evict()
+            if self._shared is not None:
+                self._purge()
+    
+    def _evict(self):
+        # Urutan OrderedDict = urutan kedaluwarsa, cukup periksa bagian depan
+        now = self.clock()
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.expires_at > now and len(self._sessions) <= self.max_sessions:
+                break
+            self._sessions.popitem(last=False)
+    
+    def _maybe_purge(self):
+        now = self.clock()
+        if self._purged_at is None or now - self._purged_at >= self.purge_interval:
+            self._purge()
+    
+    def _purge(self):
+        now = time.time()
+        self._shared.execute('BEGIN IMMEDIATE')
+        self._shared.execute(
+            'DELETE FROM shared_session_answer WHERE session_id IN '
+            '(SELECT session_id FROM shared_session WHERE expires_at <= ?)', (now,)
+        )
+        self._shared.execute('DELETE FROM shared_session WHERE expires_at <= ?', (now,))
+        self._shared.execute('COMMIT')
+        self._purged_at = self.clock()
+    
+    def _load_shared(self, session_id):
+        now = time.time()
+        row = self._shared.execute(
+            'SELECT user_id, hypothesis_id FROM shared_session WHERE session_id = ? AND expires_at > ?',
+            (session_id, now)
+        ).fetchone()
+        if row is None:
+            return None
+        self._shared.execute(
+            'UPDATE shared_session SET expires_at = ? WHERE session_id = ?', (now + self.ttl, session_id)
+        )
+        
+        stored = self._shared.execute(
+            'SELECT symptom_id, value FROM shared_session_answer WHERE session_id = ?', (session_id,)
+        ).fetchall()
+        # Gejala yang ditambahkan worker lain setelah hot reload
+        self._add_symptoms(symptom_id for symptom_id, _ in stored)
+        answers = array('b', [UNANSWERED]) * len(self.symptom_ids)
+        for symptom_id, value in stored:
+            answers[self.symptom_index[symptom_id]] = value
+        return QuestionnaireSession(session_id, row[0], row[1], answers, self.clock() + self.ttl)
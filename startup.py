@@ -0,0 +1,81 @@
+import threading
+import time
+from datetime import datetime
+
+# Fase startup worker (skema, pool, knowledge base, cache) dengan pencatatan
+# waktu tiap fase. Worker baru dinyatakan siap (/readyz) setelah semua fase
+# selesai, sehingga request pertama tidak membayar cache yang masih dingin.
+
+class Skipped(Exception):
+    """Fase tidak dijalankan (misal dimatikan lewat konfigurasi)"""
+
+class StartupPhases:
+    """
+    Menjalankan fase startup berurutan dan menyimpan laporannya.
+    
+    Args:
+        log (callable): Tujuan log waktu tiap fase
+    """
+    
+    def __init__(self, log=print):
+        self.log = log
+        self.phases = []
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.total_ms = None
+        self._ready = threading.Event()
+    
+    @property
+    def ready(self):
+        return self._ready.is_set()
+    
+    def mark_ready(self):
+        self._ready.set()
+    
+    def run(self, phases):
+        """
+        Args:
+            phases (list): (nama, callable) yang mengembalikan keterangan
+                singkat (str) atau None; raise Skipped untuk melewati fase
+        
+        Returns:
+            bool: True jika semua fase berhasil (worker siap)
+        """
+        self.started_at = datetime.utcnow()
+        started = time.perf_counter()
+        for name, func in phases:
+            phase_started = time.perf_counter()
+            entry = {'name': name, 'status': 'ok'}
+            try:
+                detail = func()
+            except Skipped as e:
+                entry['status'] = 'skipped'
+                detail = str(e) or None
+            except Exception as e:
+                entry['status'] = 'fail'
+                detail = self.error = f"{type(e).__name__}: {next(iter(str(e).splitlines()), '')}"
+            entry['ms'] = round((time.perf_counter() - phase_started) * 1000, 1)
+            if detail:
+                entry['detail'] = detail
+            self.phases.append(entry)
+            self.log(f"Startup {name}: {entry['status']} ({entry['ms']:.1f} ms)" + (f" - {detail}" if detail else ''))
+            if entry['status'] == 'fail':
+                self.log("Startup berhenti; worker tidak dinyatakan siap")
+                return False
+        
+        self.finished_at = datetime.utcnow()
+        self.total_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.log(f"Startup selesai dalam {self.total_ms:.1f} ms")
+        self.mark_ready()
+        return True
+    
+    def report(self):
+        return {
+            'ready': self.ready,
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+            'totalMs': self.total_ms,
+            'phases': list(self.phases),
+            'error': self.error
+        }
@@ -0,0 +1,306 @@
+import json
+import sqlite3
+import threading
+import time
+from sqlalchemy import table, column, select, update, insert, func
+
+# Mode write-behind submit kuesioner: result diberi id dari blok yang
+# dipesan di database, dicatat ke journal SQLite lokal (durable) lalu langsung
+# di-acknowledge. Thread penulis memindahkan isi journal ke database dalam
+# transaksi berkelompok; journal yang tersisa saat proses mati diputar ulang
+# ketika startup. Flush bersifat idempoten (id yang sudah ada dilewati).
+# Selama mode ini aktif, result dari jalur lain juga diberi id dari blok
+# yang sama sehingga id journal tidak pernah dipakai result lain. Record yang
+# ditolak database secara permanen dipindah ke tabel dead letter agar tidak
+# menahan record lain di belakangnya.
+
+result_id_block_table = table('result_id_block', column('id'), column('next_id'))
+result_table = table('result', column('id'))
+
+def reserve_id_block(connection, size):
+    """
+    Memesan `size` id result berurutan secara atomik (dalam transaksi
+    pemanggil). Blok tidak pernah mundur di bawah MAX(result.id) sehingga
+    aman setelah data diisi lewat jalur biasa.
+    
+    Returns:
+        int: id pertama blok
+    """
+    next_id = connection.execute(
+        select(result_id_block_table.c.next_id).where(result_id_block_table.c.id == 1).with_for_update()
+    ).scalar()
+    max_id = connection.execute(select(func.coalesce(func.max(result_table.c.id), 0))).scalar()
+    start = max(next_id or 0, max_id + 1)
+    if next_id is None:
+        connection.execute(insert(result_id_block_table).values(id=1, next_id=start + size))
+    else:
+        connection.execute(
+            update(result_id_block_table).where(result_id_block_table.c.id == 1).values(next_id=start + size)
+        )
+    return start
+
+class IdConflict(Exception):
+    """Id record journal sudah dipakai result lain di database"""
+    
+    def __init__(self, result_id):
+        super().__init__(f"Id result {result_id} sudah dipakai result lain")
+        self.result_id = result_id
+
+class IdAllocator:
+    """Membagikan id dari blok yang dipesan; blok baru dipesan saat habis"""
+    
+    def __init__(self, reserve, block_size=100):
+        self.reserve = reserve
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+    
+    def next_id(self):
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self.reserve(self.block_size)
+                self._end = self._next + self.block_size
+            result_id = self._next
+            self._next += 1
+            return result_id
+
+class SubmissionJournal:
+    """
+    Journal submit di file SQLite lokal (WAL, synchronous=FULL): append
+    baru selesai setelah data aman di disk. Entri yang sedang di-flush
+    ditandai claimed_at; klaim yang lebih lama dari stale_after dianggap
+    milik penulis yang mati dan boleh diambil lagi.
+    """
+    
+    def __init__(self, path):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=FULL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS submission_journal ('
+            'result_id INTEGER PRIMARY KEY, record TEXT NOT NULL, claimed_at REAL, idempotency_key TEXT)'
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS idx_submission_journal_key ON submission_journal (idempotency_key)'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS submission_dead_letter ('
+            'result_id INTEGER PRIMARY KEY, record TEXT NOT NULL, error TEXT, failed_at REAL)'
+        )
+        self._lock = threading.Lock()
+    
+    def append(self, result_id, record):
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO submission_journal (result_id, record, idempotency_key) VALUES (?, ?, ?)',
+                (result_id, json.dumps(record), record.get('idempotencyKey'))
+            )
+    
+    def get(self, result_id):
+        """Record yang belum di-flush, atau None"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT record FROM submission_journal WHERE result_id = ?', (result_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def find_key(self, user_id, key):
+        """id result yang belum di-flush untuk kunci idempotensi milik user, atau None"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT result_id, record FROM submission_journal WHERE idempotency_key = ?', (key,)
+            ).fetchall()
+        for result_id, record in rows:
+            if json.loads(record)['userId'] == user_id:
+                return result_id
+        return None
+    
+    def claim(self, limit, stale_after, now=None):
+        """Mengambil sampai `limit` record yang belum diklaim (atau klaimnya basi)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._db.execute(
+                    'SELECT result_id, record FROM submission_journal '
+                    'WHERE claimed_at IS NULL OR claimed_at < ? ORDER BY result_id LIMIT ?',
+                    (now - stale_after, limit)
+                ).fetchall()
+                self._db.executemany(
+                    'UPDATE submission_journal SET claimed_at = ? WHERE result_id = ?',
+                    [(now, result_id) for result_id, _ in rows]
+                )
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+        return [json.loads(record) for _, record in rows]
+    
+    def release(self, result_ids):
+        """Mengembalikan klaim (flush gagal) agar dicoba lagi"""
+        with self._lock:
+            self._db.executemany(
+                'UPDATE submission_journal SET claimed_at = NULL WHERE result_id = ?',
+                [(result_id,) for result_id in result_ids]
+            )
+    
+    def complete(self, result_ids):
+        with self._lock:
+            self._db.executemany(
+                'DELETE FROM submission_journal WHERE result_id = ?', [(result_id,) for result_id in result_ids]
+            )
+    
+    def dead_letter(self, result_id, error, now=None):
+        """Memindahkan record yang tidak bisa disimpan ke submission_dead_letter"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO submission_dead_letter (result_id, record, error, failed_at) '
+                    'SELECT result_id, record, ?, ? FROM submission_journal WHERE result_id = ?',
+                    (error, now, result_id)
+                )
+                self._db.execute('DELETE FROM submission_journal WHERE result_id = ?', (result_id,))
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+    
+    def dead_letters(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM submission_dead_letter').fetchone()[0]
+    
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM submission_journal').fetchone()[0]
+
+class WriteBehindQueue:
+    """
+    Antrian submit dengan penulis di background thread.
+    
+    Args:
+        journal (SubmissionJournal): Journal durable
+        allocator (IdAllocator): Sumber id result
+        flush (callable): flush(records) menyimpan banyak record dalam satu
+            transaksi database; harus idempoten terhadap id yang sudah ada
+        batch_size (int): Maksimum record per transaksi
+        interval (float): Jeda maksimum sebelum record di-flush (detik)
+        stale_after (float): Umur klaim yang dianggap basi (detik)
+        permanent_errors (tuple): Exception dari flush yang berarti record
+            ditolak (bukan database tidak tersedia); record tersebut
+            dipindah ke dead letter
+    """
+    
+    def __init__(self, journal, allocator, flush, batch_size=200, interval=0.5, stale_after=60.0,
+                 permanent_errors=(IdConflict,), log=print):
+        self.journal = journal
+        self.allocator = allocator
+        self.flush = flush
+        self.permanent_errors = permanent_errors
+        self.batch_size = batch_size
+        self.interval = interval
+        self.stale_after = stale_after
+        self.log = log
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._since_flush = 0
+        self.flushed = 0
+        self.failures = 0
+    
+    def submit(self, record):
+        """Mencatat record ke journal; mengembalikan id result yang diberikan"""
+        result_id = self.allocator.next_id()
+        record = dict(record, id=result_id)
+        self.journal.append(result_id, record)
+        self._since_flush += 1
+        if self._since_flush >= self.batch_size:
+            self._wake.set()
+        return result_id
+    
+    def pending(self, result_id):
+        return self.journal.get(result_id)
+    
+    def flush_batch(self):
+        """Satu transaksi flush; mengembalikan jumlah record yang diproses"""
+        records = self.journal.claim(self.batch_size, self.stale_after)
+        if not records:
+            return 0
+        ids = [record['id'] for record in records]
+        try:
+            self.flush(records)
+        except self.permanent_errors:
+            # Satu record yang ditolak tidak boleh menahan seluruh batch
+            self._flush_each(records)
+        except Exception:
+            self.journal.release(ids)
+            raise
+        else:
+            self.journal.complete(ids)
+            self.flushed += len(records)
+        return len(records)
+    
+    def _flush_each(self, records):
+        """Flush satu per satu; record yang tetap ditolak masuk dead letter"""
+        for index, record in enumerate(records):
+            try:
+                self.flush([record])
+            except self.permanent_errors as e:
+                self.journal.dead_letter(record['id'], f"{type(e).__name__}: {e}")
+                self.log(f"Record write-behind {record['id']} dipindah ke dead letter: {e}")
+                continue
+            except Exception:
+                self.journal.release([pending['id'] for pending in records[index:]])
+                raise
+            self.journal.complete([record['id']])
+            self.flushed += 1
+    
+    def replay(self):
+        """
+        Memutar ulang journal sebelum melayani request: record yang belum
+        diklaim dan klaim basi (lebih lama dari stale_after) dari proses yang
+        mati. Klaim yang masih baru milik worker lain yang berbagi journal
+        tidak diambil, agar satu record tidak di-flush dua penulis sekaligus;
+        klaim proses yang baru mati diambil thread penulis setelah basi.
+        """
+        total = 0
+        while True:
+            count = self.flush_batch()
+            if not count:
+                return total
+            total += count
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self):
+        backoff = self.interval
+        while not self._stop.is_set():
+            self._wake.wait(backoff)
+            self._wake.clear()
+            self._since_flush = 0
+            try:
+                while self.flush_batch():
+                    pass
+                backoff = self.interval
+            except Exception as e:
+                # Database tidak tersedia: record tetap di journal, coba lagi nanti
+                self.failures += 1
+                self.log(f"Flush write-behind gagal: {e}")
+                backoff = min(backoff * 2, 30.0)
+        # Sisa antrian saat shutdown normal
+        try:
+            while self.flush_batch():
+                pass
+        except Exception as e:
+            self.log(f"Flush write-behind saat berhenti gagal: {e}")